@@ -40,6 +40,9 @@ from .src.infrastructure.persistence.incremental_store import IncrementalStore
 from .src.infrastructure.persistence.platform_group_registry import (
     PlatformGroupRegistry,
 )
+from .src.infrastructure.platform.adapters.discord_adapter import DiscordAdapter
+from .src.infrastructure.platform.adapters.onebot_adapter import OneBotAdapter
+from .src.infrastructure.platform.adapters.telegram_adapter import TelegramAdapter
 from .src.infrastructure.platform.bot_manager import BotManager
 from .src.infrastructure.platform.template_preview import (
     TelegramTemplatePreviewHandler,
@@ -262,9 +265,16 @@ class GroupDailyAnalysis(Star):
             if self.template_preview_router:
                 await self.template_preview_router.unregister_handlers()
 
+            if self.incremental_store:
+                await self.incremental_store.flush()
+
             if self.report_generator:
                 await self.report_generator.close()
 
+            await DiscordAdapter.close_http_session()
+            await OneBotAdapter.close_http_session()
+            await TelegramAdapter.close_http_session()
+
             # 3. [关键修复] 只有在任务全部清理后，才清理引用。
             # 实际上，在 terminate 结束后，self 本身就会被 GC 释放，
             # 这里的显式 None 更多是为了协助循环引用清理，但由于异步任务存在竞态，
@@ -17,6 +17,8 @@ from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Any
 
+from ...utils.time_utils import today_str
+
 
 @dataclass
 class IncrementalBatch:
@@ -272,7 +274,7 @@ class IncrementalState:
             str: 如 "2024-01-15" 或 "2024-01-14 ~ 2024-01-15"
         """
         if self.window_start <= 0 or self.window_end <= 0:
-            return datetime.now().strftime("%Y-%m-%d")
+            return today_str()
 
         start_date = datetime.fromtimestamp(self.window_start).strftime("%Y-%m-%d")
         end_date = datetime.fromtimestamp(self.window_end).strftime("%Y-%m-%d")
@@ -31,6 +31,7 @@ class PlatformCapabilities:
         supports_file_message (bool): 是否能发送文件/PDF
         supports_forward_message (bool): 是否支持转发链（合并转发）
         supports_reply_message (bool): 是否支持回复引用
+        supports_base64_upload (bool): 文件/相册上传是否可直接接收 base64:// 负载
         max_text_length (int): 单条回复最大文本长度
         max_image_size_mb (float): 最大图片上传限制 (MB)
         supports_at_all (bool): 是否能 @全员
@@ -64,6 +65,7 @@ class PlatformCapabilities:
     supports_file_message: bool = False
     supports_forward_message: bool = False
     supports_reply_message: bool = False
+    supports_base64_upload: bool = False
     max_text_length: int = 4096
     max_image_size_mb: float = 10.0
 
@@ -152,6 +154,7 @@ ONEBOT_V11_CAPABILITIES = PlatformCapabilities(
     supports_file_message=True,
     supports_forward_message=True,
     supports_reply_message=True,
+    supports_base64_upload=True,
     max_text_length=4500,
     supports_at_all=True,
     supports_recall=True,
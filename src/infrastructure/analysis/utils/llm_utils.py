@@ -268,6 +268,9 @@ async def call_provider_with_retry(
     # 用户可在 AstrBot WebUI 中为每个 Provider 配置 timeout 参数
     retries = config_manager.get_llm_retries()
     backoff = config_manager.get_llm_backoff()
+    # 退避时间表预先算好：队列最长为主 Provider 与降级 Provider 各 retries 次
+    # 第 n 次失败后等待 backoff * 2^(n-1) 秒（另加随机抖动）
+    backoff_delays = tuple(backoff * (1 << n) for n in range(2 * retries))
     enable_streaming_llm_call = config_manager.get_enable_streaming_llm_call()
 
     # 1. 确定我们要尝试的 Provider 队列
@@ -386,7 +389,7 @@ async def call_provider_with_retry(
             is_last_attempt = i == len(attempt_queue) - 1
             if not is_last_attempt:
                 # Exponential backoff with jitter: backoff * (2 ^ (attempt_num - 1)) + random jitter
-                sleep_time = backoff * (2 ** (attempt_num - 1)) + random.uniform(0, 1)
+                sleep_time = backoff_delays[i] + random.uniform(0, 1)
                 logger.debug(f"等待 {sleep_time:.2f} 秒后重试...")
                 await asyncio.sleep(sleep_time)
 
@@ -3,14 +3,21 @@
 
 该模块提供分析结果和历史记录的持久化存储。
 它封装了现有的 history_manager 功能。
+
+每个群组的历史 JSON 旁维护一个日期索引文件 (group_{id}.idx)，
+按行存放已存档的日期，供存在性检查快速读取而无需解析完整历史。
 """
 
+import copy
 import json
-from datetime import datetime
+import os
+from collections.abc import Iterable, Mapping
+from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any
 
 from ...utils.logger import logger
+from ...utils.time_utils import today_str
 
 
 class HistoryRepository:
@@ -25,6 +32,9 @@ class HistoryRepository:
         history_dir (Path): 专门存放历史记录的子目录
     """
 
+    # 群组路径缓存上限，超出后整体清空，避免大量临时群组导致内存增长
+    PATH_CACHE_SIZE = 1024
+
     def __init__(self, data_dir: str):
         """
         初始化历史仓库。
@@ -34,15 +44,105 @@ class HistoryRepository:
         """
         self.data_dir = Path(data_dir)
         self.history_dir = self.data_dir / "history"
+        # group_id -> (历史 JSON 路径, 日期索引路径)
+        self._path_cache: dict[str, tuple[Path, Path]] = {}
+        # 只读历史缓存: group_id -> ((mtime_ns, size), 原始历史字典)
+        self._history_cache: dict[str, tuple[tuple[int, int], dict[str, Any]]] = {}
         self._ensure_directories()
 
     def _ensure_directories(self) -> None:
         """内部方法：确保所需的目录结构已创建。"""
         self.history_dir.mkdir(parents=True, exist_ok=True)
 
+    def _get_group_paths(self, group_id: str) -> tuple[Path, Path]:
+        """内部方法：获取并缓存特定群组的历史 JSON 与日期索引文件路径。"""
+        paths = self._path_cache.get(group_id)
+        if paths is None:
+            if len(self._path_cache) >= self.PATH_CACHE_SIZE:
+                self._path_cache.clear()
+            paths = self._path_cache[group_id] = (
+                self.history_dir / f"group_{group_id}.json",
+                self.history_dir / f"group_{group_id}.idx",
+            )
+        return paths
+
     def _get_group_history_path(self, group_id: str) -> Path:
         """内部方法：获取特定群组的历史 JSON 文件路径。"""
-        return self.history_dir / f"group_{group_id}.json"
+        return self._get_group_paths(group_id)[0]
+
+    def _get_date_index_path(self, group_id: str) -> Path:
+        """内部方法：获取特定群组的日期索引文件路径。"""
+        return self._get_group_paths(group_id)[1]
+
+    def _write_date_index(self, group_id: str, dates: Iterable[str]) -> None:
+        """
+        内部方法：以换行分隔的形式重写群组的日期索引。
+
+        写入失败时删除索引文件，使后续查询回退到完整历史加载，避免索引过期。
+        """
+        index_path = self._get_date_index_path(group_id)
+        try:
+            with open(index_path, "w", encoding="utf-8") as f:
+                f.write("\n".join(sorted(dates)))
+        except Exception as e:
+            logger.warning(f"写入群 {group_id} 的日期索引失败: {e}")
+            index_path.unlink(missing_ok=True)
+
+    def _read_date_index(self, group_id: str) -> set[str] | None:
+        """
+        内部方法：读取群组的日期索引。
+
+        Returns:
+            set[str] | None: 已存档日期集合，索引文件不存在或不可读时返回 None
+        """
+        try:
+            with open(self._get_date_index_path(group_id), encoding="utf-8") as f:
+                return {line for line in f.read().split("\n") if line}
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"读取群 {group_id} 的日期索引失败: {e}")
+            return None
+
+    def _load_raw_history(self, group_id: str) -> dict[str, Any]:
+        """内部方法：从磁盘加载历史记录字典。"""
+        try:
+            with open(self._get_group_history_path(group_id), encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {"daily": {}, "group_id": group_id}
+        except Exception as e:
+            logger.error(f"加载群 {group_id} 的历史记录失败: {e}")
+            return {"daily": {}, "group_id": group_id}
+
+    def _load_readonly(self, group_id: str) -> Mapping[str, Any]:
+        """
+        内部方法：以只读方式获取历史记录。
+
+        结果按文件的 (mtime_ns, size) 缓存，文件未变化时直接返回共享的缓存对象，
+        省去重复的读取与解析。调用方不得修改返回值及其中的条目。
+        """
+        try:
+            stat = self._get_group_history_path(group_id).stat()
+        except FileNotFoundError:
+            self._history_cache.pop(group_id, None)
+            return {"daily": {}, "group_id": group_id}
+        version = (stat.st_mtime_ns, stat.st_size)
+        cached = self._history_cache.get(group_id)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        history = self._load_raw_history(group_id)
+        if len(self._history_cache) >= self.PATH_CACHE_SIZE:
+            self._history_cache.clear()
+        self._history_cache[group_id] = (version, history)
+        return history
+
+    def _write_history(self, group_id: str, history: dict[str, Any]) -> None:
+        """内部方法：整体覆盖写入历史 JSON 文件，并使只读缓存失效。"""
+        with open(self._get_group_history_path(group_id), "w", encoding="utf-8") as f:
+            json.dump(history, f, ensure_ascii=False, indent=2)
+        self._history_cache.pop(group_id, None)
 
     def save_analysis_result(
         self,
@@ -62,24 +162,22 @@ class HistoryRepository:
             bool: 保存成功返回 True，发生异常返回 False
         """
         try:
-            date_str = date_str or datetime.now().strftime("%Y-%m-%d")
-            history = self.load_group_history(group_id)
-
+            date_str = date_str or today_str()
+            now = datetime.now().isoformat()
             # 注入执行时间戳
             if "timestamp" not in result:
-                result["timestamp"] = datetime.now().isoformat()
+                result["timestamp"] = now
 
-            # 结构化存储：二级映射 {date -> result}
-            if "daily" not in history:
-                history["daily"] = {}
+            history = self._load_raw_history(group_id)
 
-            history["daily"][date_str] = result
-            history["last_updated"] = datetime.now().isoformat()
+            # 结构化存储：二级映射 {date -> result}
+            daily = history.setdefault("daily", {})
+            daily[date_str] = result
+            history["last_updated"] = now
 
-            # 原子写入（覆盖）
-            history_path = self._get_group_history_path(group_id)
-            with open(history_path, "w", encoding="utf-8") as f:
-                json.dump(history, f, ensure_ascii=False, indent=2)
+            # 覆盖写入，同一日期只保留最新结果
+            self._write_history(group_id, history)
+            self._write_date_index(group_id, daily.keys())
 
             logger.debug(f"已保存群 {group_id} 在 {date_str} 的历史分析记录")
             return True
@@ -98,15 +196,7 @@ class HistoryRepository:
         Returns:
             dict[str, Any]: 历史数据字典，若文件不存在则返回包含空 daily 结构的初始字典
         """
-        try:
-            history_path = self._get_group_history_path(group_id)
-            if history_path.exists():
-                with open(history_path, encoding="utf-8") as f:
-                    return json.load(f)
-            return {"daily": {}, "group_id": group_id}
-        except Exception as e:
-            logger.error(f"加载群 {group_id} 的历史记录失败: {e}")
-            return {"daily": {}, "group_id": group_id}
+        return self._load_raw_history(group_id)
 
     def get_analysis_result(
         self, group_id: str, date_str: str
@@ -119,10 +209,11 @@ class HistoryRepository:
             date_str (str): 目标日期 (YYYY-MM-DD)
 
         Returns:
-            Optional[dict[str, Any]]: 分析结果字典，未找到则返回 None
+            Optional[dict[str, Any]]: 分析结果字典的独立副本，未找到则返回 None
         """
-        history = self.load_group_history(group_id)
-        return history.get("daily", {}).get(date_str)
+        result = self._load_readonly(group_id).get("daily", {}).get(date_str)
+        # 返回副本，避免调用方修改污染共享的只读缓存
+        return copy.deepcopy(result) if result is not None else None
 
     def get_recent_results(self, group_id: str, limit: int = 7) -> list[dict[str, Any]]:
         """
@@ -133,19 +224,21 @@ class HistoryRepository:
             limit (int): 最大返回条数
 
         Returns:
-            list[dict[str, Any]]: 按日期降序排列的结果列表
+            list[dict[str, Any]]: 按日期降序排列的结果列表（各条目均为独立副本）
         """
-        history = self.load_group_history(group_id)
-        daily = history.get("daily", {})
+        daily = self._load_readonly(group_id).get("daily", {})
 
         # 按日期字符串字典序降序排列（YYYY-MM-DD 天然有序）
         sorted_dates = sorted(daily.keys(), reverse=True)[:limit]
-        return [daily[date] for date in sorted_dates]
+        return [copy.deepcopy(daily[date]) for date in sorted_dates]
 
     def has_analysis_for_date(self, group_id: str, date_str: str) -> bool:
         """
         检查指定日期是否已经生成过分析。
 
+        优先读取轻量的日期索引文件；索引缺失时（如旧版数据）回退到
+        完整历史加载，并顺便重建索引。
+
         Args:
             group_id (str): 群组 ID
             date_str (str): 日期字符串
@@ -153,7 +246,16 @@ class HistoryRepository:
         Returns:
             bool: 存在记录则返回 True
         """
-        return self.get_analysis_result(group_id, date_str) is not None
+        dates = self._read_date_index(group_id)
+        if dates is not None:
+            return date_str in dates
+
+        history_path = self._get_group_history_path(group_id)
+        if not history_path.exists():
+            return False
+        daily = self._load_readonly(group_id).get("daily", {})
+        self._write_date_index(group_id, daily.keys())
+        return date_str in daily
 
     def delete_old_history(self, group_id: str, keep_days: int = 30) -> int:
         """
@@ -167,27 +269,22 @@ class HistoryRepository:
             int: 实际删除的记录条数
         """
         try:
-            history = self.load_group_history(group_id)
+            history = self._load_raw_history(group_id)
             daily = history.get("daily", {})
 
             # 计算截止日期边界
-            from datetime import timedelta
-
             cutoff = (datetime.now() - timedelta(days=keep_days)).strftime("%Y-%m-%d")
 
-            # 筛选已过期的日期
-            dates_to_delete = [date for date in daily.keys() if date < cutoff]
-
-            for date in dates_to_delete:
-                del daily[date]
+            # 单次遍历重建映射，仅保留未过期的日期
+            retained = {date: v for date, v in daily.items() if date >= cutoff}
+            deleted_count = len(daily) - len(retained)
 
-            if dates_to_delete:
-                history["daily"] = daily
-                history_path = self._get_group_history_path(group_id)
-                with open(history_path, "w", encoding="utf-8") as f:
-                    json.dump(history, f, ensure_ascii=False, indent=2)
+            if deleted_count:
+                history["daily"] = retained
+                self._write_history(group_id, history)
+                self._write_date_index(group_id, retained.keys())
 
-            return len(dates_to_delete)
+            return deleted_count
 
         except Exception as e:
             logger.error(f"清理群 {group_id} 的陈旧历史记录失败: {e}")
@@ -201,12 +298,17 @@ class HistoryRepository:
             list[str]: 群组 ID 字符串列表
         """
         try:
-            groups = []
-            for file_path in self.history_dir.glob("group_*.json"):
+            # 直接扫描目录项，避免 glob 的模式匹配与逐项 Path 构造；
+            # DirEntry.is_file() 复用扫描时缓存的 stat 信息
+            with os.scandir(self.history_dir) as it:
                 # 从文件名反推群组 ID (group_123.json -> 123)
-                group_id = file_path.stem.replace("group_", "")
-                groups.append(group_id)
-            return groups
+                return [
+                    entry.name[6:-5]
+                    for entry in it
+                    if entry.name.startswith("group_")
+                    and entry.name.endswith(".json")
+                    and entry.is_file()
+                ]
         except Exception as e:
             logger.error(f"列出历史记录群组失败: {e}")
             return []
@@ -5,14 +5,23 @@
 支持按时间窗口查询批次、批次索引管理和过期批次清理。
 
 KV 键设计：
-- 批次索引: incr_batch_index_{group_id}
+- 批次索引快照: incr_batch_index_{group_id}
   值: [{"batch_id": "xxx", "timestamp": 1234567890.0}, ...]
+- 批次索引追加日志: incr_batch_index_wal_{group_id}
+  值: 快照之后新增的索引条目，格式同上
 - 批次数据: incr_batch_{group_id}_{batch_id}
   值: IncrementalBatch.to_dict()
 - 最后分析消息时间戳: incr_last_ts_{group_id}
   值: int (epoch timestamp)
+
+批次索引在内存中缓存并按时间戳升序维护，窗口查询与过期清理通过二分查找定位边界；
+保存批次时仅更新缓存并延迟合并写回 KV，插件卸载时需调用 flush() 将未写回的索引落盘。
+新增条目只写入体积有限的追加日志，日志达到阈值、执行清理或 flush() 时才重写完整快照；
+加载时以快照为基础重放日志。
 """
 
+import asyncio
+from bisect import bisect_left, bisect_right
 from typing import Any
 
 from ...domain.entities.incremental_state import IncrementalBatch
@@ -29,13 +38,20 @@ class IncrementalStore:
     - get_last_analyzed_timestamp / update_last_analyzed_timestamp: 跨批次去重
     - cleanup_old_batches: 清理过期批次
     - get_batch_count: 获取当前批次总数（状态查询用）
+    - flush: 将内存中未写回的批次索引落盘
     """
 
     # KV 键前缀
     INDEX_PREFIX = "incr_batch_index"
+    INDEX_WAL_PREFIX = "incr_batch_index_wal"
     BATCH_PREFIX = "incr_batch"
     LAST_TS_PREFIX = "incr_last_ts"
 
+    # 索引延迟写回的合并窗口（秒）
+    INDEX_FLUSH_DELAY = 1.0
+    # 追加日志条目数达到此阈值时压缩为完整快照
+    INDEX_WAL_COMPACT_THRESHOLD = 64
+
     def __init__(self, star_instance: Any):
         """
         初始化批次持久化仓储。
@@ -44,6 +60,15 @@ class IncrementalStore:
             star_instance: Star 插件实例，用于访问底层 KV 存储引擎
         """
         self.plugin = star_instance
+        # 批次索引内存缓存: group_id -> 索引条目列表
+        self._index_cache: dict[str, list[dict]] = {}
+        # 与索引条目一一对应的时间戳列表，用于二分查找
+        self._ts_cache: dict[str, list[float]] = {}
+        # 尚未并入快照的索引条目（与 KV 中的追加日志对应）
+        self._index_wal: dict[str, list[dict]] = {}
+        # 已修改但尚未写回 KV 的群组
+        self._index_dirty: set[str] = set()
+        self._flush_task: asyncio.Task | None = None
 
     # ================================================================
     # 键构建
@@ -53,9 +78,17 @@ class IncrementalStore:
         """构建批次索引键"""
         return f"{self.INDEX_PREFIX}_{group_id}"
 
+    def _index_wal_key(self, group_id: str) -> str:
+        """构建批次索引追加日志键"""
+        return f"{self.INDEX_WAL_PREFIX}_{group_id}"
+
+    def _batch_key_prefix(self, group_id: str) -> str:
+        """构建指定群的批次数据键前缀，批量构建键时只格式化一次"""
+        return f"{self.BATCH_PREFIX}_{group_id}_"
+
     def _batch_key(self, group_id: str, batch_id: str) -> str:
         """构建单个批次数据键"""
-        return f"{self.BATCH_PREFIX}_{group_id}_{batch_id}"
+        return self._batch_key_prefix(group_id) + batch_id
 
     def _last_ts_key(self, group_id: str) -> str:
         """构建最后分析消息时间戳键"""
@@ -69,28 +102,57 @@ class IncrementalStore:
         """
         获取指定群的批次索引列表。
 
+        优先返回内存缓存，未命中时从 KV 加载快照并重放追加日志，
+        按时间戳排序后缓存。返回的列表即缓存本身，调用方不应修改。
+
         Args:
             group_id: 群组 ID
 
         Returns:
             list[dict]: 索引条目列表，每项包含 batch_id 和 timestamp
         """
+        cached = self._index_cache.get(group_id)
+        if cached is not None:
+            return cached
+
         key = self._index_key(group_id)
+        wal_key = self._index_wal_key(group_id)
         try:
-            data = await self.plugin.get_kv_data(key, None)
-            if data is None:
-                return []
-            if isinstance(data, list):
-                return data
-            logger.warning(f"批次索引数据格式异常 (Key: {key}): {type(data)}")
-            return []
+            data, wal_data = await asyncio.gather(
+                self.plugin.get_kv_data(key, None),
+                self.plugin.get_kv_data(wal_key, None),
+            )
+            index = self._coerce_index(key, data)
+            wal = self._coerce_index(wal_key, wal_data)
+            # 加载期间可能已有并发调用填充缓存，以先到者为准
+            cached = self._index_cache.get(group_id)
+            if cached is not None:
+                return cached
+            # 重放追加日志；压缩中断时日志条目可能已存在于快照中，按 batch_id 去重
+            known_ids = {entry.get("batch_id") for entry in index}
+            index.extend(e for e in wal if e.get("batch_id") not in known_ids)
+            index.sort(key=lambda x: x.get("timestamp", 0))
+            self._index_wal[group_id] = wal
+            self._index_cache[group_id] = index
+            self._ts_cache[group_id] = [entry.get("timestamp", 0) for entry in index]
+            return index
         except Exception as e:
             logger.error(f"读取批次索引失败 (Key: {key}): {e}", exc_info=True)
             return []
 
+    @staticmethod
+    def _coerce_index(key: str, data: Any) -> list[dict]:
+        """校验从 KV 读取的索引数据，格式异常时视为空列表"""
+        if data is None:
+            return []
+        if isinstance(data, list):
+            return data
+        logger.warning(f"批次索引数据格式异常 (Key: {key}): {type(data)}")
+        return []
+
     async def _save_index(self, group_id: str, index: list[dict]) -> None:
         """
-        保存批次索引列表。
+        保存批次索引快照。
 
         Args:
             group_id: 群组 ID
@@ -103,6 +165,70 @@ class IncrementalStore:
             logger.error(f"保存批次索引失败 (Key: {key}): {e}", exc_info=True)
             raise
 
+    async def _persist_index(self, group_id: str, compact: bool = False) -> None:
+        """
+        将指定群的内存索引持久化。
+
+        常规情况下只写入追加日志；日志达到阈值或要求压缩时，
+        先写入完整快照，再截断已并入快照的日志条目。
+
+        Args:
+            group_id: 群组 ID
+            compact: 是否强制压缩为完整快照
+        """
+        index = self._index_cache.get(group_id)
+        if index is None:
+            return
+        wal = self._index_wal.setdefault(group_id, [])
+
+        if compact or len(wal) >= self.INDEX_WAL_COMPACT_THRESHOLD:
+            persisted = len(wal)
+            await self._save_index(group_id, list(index))
+            # 写快照期间新追加的条目保留在日志中
+            del wal[:persisted]
+
+        wal_key = self._index_wal_key(group_id)
+        try:
+            await self.plugin.put_kv_data(wal_key, list(wal))
+        except Exception as e:
+            logger.error(f"保存批次索引日志失败 (Key: {wal_key}): {e}", exc_info=True)
+            raise
+
+    def _schedule_index_flush(self) -> None:
+        """调度一次延迟写回，合并窗口内的多次索引修改只写一次 KV"""
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._delayed_index_flush())
+
+    async def _delayed_index_flush(self) -> None:
+        """等待合并窗口结束后写回所有脏索引"""
+        await asyncio.sleep(self.INDEX_FLUSH_DELAY)
+        await self._flush_dirty_indexes()
+
+    async def _flush_dirty_indexes(self, compact: bool = False) -> None:
+        """将所有脏索引写回 KV，写入失败的群组保留脏标记以便下次重试"""
+        for group_id in list(self._index_dirty):
+            try:
+                await self._persist_index(group_id, compact=compact)
+                self._index_dirty.discard(group_id)
+            except Exception as e:
+                # _persist_index 已记录错误日志，此处仅标记将在下次写回时重试
+                logger.debug(f"群 {group_id} 的批次索引写回失败，保留脏标记待重试: {e}")
+
+    async def flush(self) -> None:
+        """
+        立即将内存中未写回的批次索引落盘，并压缩为完整快照。
+
+        应在插件卸载时调用，避免丢失合并窗口内的索引更新。
+        """
+        if self._flush_task and not self._flush_task.done():
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+        self._flush_task = None
+        await self._flush_dirty_indexes(compact=True)
+
     # ================================================================
     # 批次数据操作
     # ================================================================
@@ -113,7 +239,7 @@ class IncrementalStore:
 
         流程：
         1. 将批次数据写入独立 KV 键
-        2. 将批次元数据（batch_id + timestamp）追加到索引
+        2. 将批次元数据（batch_id + timestamp）追加到内存索引并调度延迟写回
 
         Args:
             batch: 要保存的增量分析批次
@@ -128,15 +254,27 @@ class IncrementalStore:
             # 1. 保存批次数据
             await self.plugin.put_kv_data(batch_key, batch.to_dict())
 
-            # 2. 更新索引
+            # 2. 更新索引（写入缓存，延迟合并写回 KV）
             index = await self._get_index(group_id)
-            index.append(
-                {
-                    "batch_id": batch.batch_id,
-                    "timestamp": batch.timestamp,
-                }
-            )
-            await self._save_index(group_id, index)
+            timestamps = self._ts_cache.get(group_id)
+            if timestamps is None:
+                # 索引读取失败时不可追加，否则写回会覆盖 KV 中的已有索引
+                raise RuntimeError("批次索引不可用")
+            entry = {
+                "batch_id": batch.batch_id,
+                "timestamp": batch.timestamp,
+            }
+            if not timestamps or batch.timestamp >= timestamps[-1]:
+                # 批次按时间单调产生，常规情况直接追加即可保持有序
+                index.append(entry)
+                timestamps.append(batch.timestamp)
+            else:
+                pos = bisect_right(timestamps, batch.timestamp)
+                index.insert(pos, entry)
+                timestamps.insert(pos, batch.timestamp)
+            self._index_wal.setdefault(group_id, []).append(entry)
+            self._index_dirty.add(group_id)
+            self._schedule_index_flush()
 
             logger.debug(
                 f"已保存批次 {batch.batch_id[:8]}... "
@@ -160,7 +298,7 @@ class IncrementalStore:
         按时间窗口查询批次列表。
 
         从索引中筛选时间戳落在 [window_start, window_end] 范围内的批次，
-        逐个加载完整批次数据。
+        并发加载完整批次数据。
 
         Args:
             group_id: 群组 ID
@@ -171,36 +309,41 @@ class IncrementalStore:
             list[IncrementalBatch]: 符合窗口范围的批次列表，按时间戳升序
         """
         index = await self._get_index(group_id)
-
-        # 筛选在窗口范围内的批次
-        matching_entries = [
-            entry
-            for entry in index
-            if window_start <= entry.get("timestamp", 0) <= window_end
-        ]
-
-        # 按时间戳升序排列
-        matching_entries.sort(key=lambda x: x.get("timestamp", 0))
+        timestamps = self._ts_cache.get(group_id, [])
+
+        # 索引按时间戳升序维护，二分定位窗口边界
+        lo = bisect_left(timestamps, window_start)
+        hi = bisect_right(timestamps, window_end)
+        matching_entries = index[lo:hi]
+
+        # 并发加载批次数据，避免逐个 await 的 N+1 往返
+        entries = [entry for entry in matching_entries if entry.get("batch_id")]
+        prefix = self._batch_key_prefix(group_id)
+        results = await asyncio.gather(
+            *(
+                self.plugin.get_kv_data(prefix + entry["batch_id"], None)
+                for entry in entries
+            ),
+            return_exceptions=True,
+        )
 
         batches: list[IncrementalBatch] = []
-        for entry in matching_entries:
-            batch_id = entry.get("batch_id", "")
-            if not batch_id:
+        for entry, data in zip(entries, results):
+            batch_id = entry["batch_id"]
+            if isinstance(data, BaseException):
+                logger.error(
+                    f"加载批次数据失败 (群 {group_id}, 批次 {batch_id[:8]}...): {data}",
+                    exc_info=data,
+                )
+                continue
+            if data is None:
+                logger.warning(f"批次数据缺失 (群 {group_id}, 批次 {batch_id[:8]}...)")
                 continue
-
-            batch_key = self._batch_key(group_id, batch_id)
             try:
-                data = await self.plugin.get_kv_data(batch_key, None)
-                if data is not None:
-                    batch = IncrementalBatch.from_dict(data)
-                    batches.append(batch)
-                else:
-                    logger.warning(
-                        f"批次数据缺失 (群 {group_id}, 批次 {batch_id[:8]}...)"
-                    )
+                batches.append(IncrementalBatch.from_dict(data))
             except Exception as e:
                 logger.error(
-                    f"加载批次数据失败 (群 {group_id}, 批次 {batch_id[:8]}...): {e}",
+                    f"解析批次数据失败 (群 {group_id}, 批次 {batch_id[:8]}...): {e}",
                     exc_info=True,
                 )
 
@@ -264,7 +407,7 @@ class IncrementalStore:
 
         流程：
         1. 从索引中分离出过期条目和保留条目
-        2. 逐个删除过期批次的 KV 数据
+        2. 并发删除过期批次的 KV 数据
         3. 用保留条目覆盖索引
 
         Args:
@@ -278,36 +421,48 @@ class IncrementalStore:
         if not index:
             return 0
 
-        # 分离过期和保留
-        expired = []
-        retained = []
-        for entry in index:
-            if entry.get("timestamp", 0) < before_timestamp:
-                expired.append(entry)
-            else:
-                retained.append(entry)
+        # 索引按时间戳升序维护，二分定位过期边界
+        timestamps = self._ts_cache.get(group_id, [])
+        expired = index[: bisect_left(timestamps, before_timestamp)]
 
         if not expired:
             return 0
 
-        # 删除过期批次数据
+        # 并发删除过期批次数据
+        expired_ids = [entry["batch_id"] for entry in expired if entry.get("batch_id")]
+        prefix = self._batch_key_prefix(group_id)
+        results = await asyncio.gather(
+            *(
+                self.plugin.put_kv_data(prefix + batch_id, None)
+                for batch_id in expired_ids
+            ),
+            return_exceptions=True,
+        )
+
         deleted_count = 0
-        for entry in expired:
-            batch_id = entry.get("batch_id", "")
-            if not batch_id:
-                continue
-            batch_key = self._batch_key(group_id, batch_id)
-            try:
-                await self.plugin.put_kv_data(batch_key, None)
-                deleted_count += 1
-            except Exception as e:
+        for batch_id, result in zip(expired_ids, results):
+            if isinstance(result, BaseException):
                 logger.error(
-                    f"删除过期批次失败 (群 {group_id}, 批次 {batch_id[:8]}...): {e}",
-                    exc_info=True,
+                    f"删除过期批次失败 (群 {group_id}, 批次 {batch_id[:8]}...): {result}",
+                    exc_info=result,
                 )
+            else:
+                deleted_count += 1
 
-        # 更新索引（仅保留未过期条目）
-        await self._save_index(group_id, retained)
+        # 原地截断缓存索引（仅保留未过期条目），保留删除期间新追加的条目；
+        # 清理操作直接写穿
+        cut = bisect_left(timestamps, before_timestamp)
+        del index[:cut]
+        del timestamps[:cut]
+        retained = index
+        try:
+            await self._persist_index(group_id, compact=True)
+        except Exception:
+            # 写穿失败时保留脏标记，交由延迟写回重试
+            self._index_dirty.add(group_id)
+            self._schedule_index_flush()
+            raise
+        self._index_dirty.discard(group_id)
 
         logger.info(
             f"清理过期批次: 群 {group_id}, "
@@ -346,6 +501,5 @@ class IncrementalStore:
             list[dict]: 批次摘要列表，按时间升序
         """
         index = await self._get_index(group_id)
-        # 按时间戳升序排列
-        index.sort(key=lambda x: x.get("timestamp", 0))
-        return index
+        # 索引已按时间戳升序维护（返回副本，避免调用方修改缓存）
+        return list(index)
@@ -29,8 +29,16 @@ class PlatformGroupRegistry:
         if not platform_key or not group_key:
             return
 
+        # Fast path: known groups are answered without touching the lock.
+        # The check and return contain no await, so they are atomic on the
+        # event loop and every message from a known group skips the queue.
+        identity = (platform_key, group_key)
+        if identity in self._known_groups:
+            return
+
         async with self._lock:
-            identity = (platform_key, group_key)
+            # Re-check under the lock: another coroutine may have registered
+            # the group while this one was waiting.
             if identity in self._known_groups:
                 return
 
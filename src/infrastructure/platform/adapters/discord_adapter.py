@@ -8,9 +8,20 @@ Discord 平台适配器
 具体实现取决于 AstrBot 的 Discord 集成方式。
 """
 
-from datetime import datetime, timedelta
+import asyncio
+import base64
+import functools
+import json
+import time
+from collections import defaultdict
+from collections.abc import AsyncIterator, Iterator
+from datetime import datetime, timedelta, timezone
+from itertools import chain
+from operator import attrgetter
 from typing import Any
 
+import aiohttp
+
 from ....utils.logger import logger
 
 try:
@@ -30,6 +41,106 @@ from ....domain.value_objects.unified_message import (
 )
 from ..base import PlatformAdapter
 
+PLATFORM_NAME = "discord"
+
+# 网络请求可预期的失败类型（未安装 discord 时不包含 SDK 异常）
+_NETWORK_ERRORS: tuple[type[BaseException], ...] = (
+    ConnectionError,
+    asyncio.TimeoutError,
+) + ((discord.HTTPException,) if discord else ())
+
+# 附件 MIME 主类型到统一内容类型的映射，未列出的类型按普通文件处理
+_MIME_MAJOR_CONTENT_TYPES = {
+    "image": MessageContentType.IMAGE,
+    "video": MessageContentType.VIDEO,
+    "audio": MessageContentType.VOICE,
+}
+
+# 原始消息 JSON 编码器（紧凑输出，保留非 ASCII 字符）
+_RAW_JSON_ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+# 转换为 OneBot 风格字典时需要的消息字段
+_RAW_MSG_FIELDS = attrgetter(
+    "message_id", "group_id", "timestamp", "sender_id", "sender_name", "sender_card"
+)
+
+# 服务器/频道元数据缓存有效期（秒），该类数据变化极少
+GROUP_CACHE_TTL = 60
+
+# 默认的一天分析窗口
+_ONE_DAY = timedelta(days=1)
+
+# 频道 ID 解析缓存的容量上限
+GID_CACHE_SIZE = 1024
+
+# Discord history 接口单次请求的消息上限
+HISTORY_PAGE_SIZE = 100
+
+# 批量查询头像时的最大并发请求数
+AVATAR_FETCH_CONCURRENCY = 16
+
+# Discord CDN 支持的头像尺寸 (2 的幂)
+_ALLOWED_AVATAR_SIZES = (16, 32, 64, 128, 256, 512, 1024, 2048, 4096)
+
+
+@functools.lru_cache(maxsize=64)
+def _snap_avatar_size(size: int) -> int:
+    """将任意尺寸对齐到 Discord 支持的最接近尺寸。"""
+    return min(_ALLOWED_AVATAR_SIZES, key=lambda x: abs(x - size))
+
+
+@functools.lru_cache(maxsize=4096)
+def _default_avatar_url(user_id: str) -> str:
+    """
+    计算 Discord 默认头像（embed avatar）地址，纯字符串运算，无需网络请求。
+
+    群分析会反复查询相同成员，结果经 LRU 缓存后重复查询仅为一次字典探测。
+    采用 Discord 新用户名体系的规则：`(user_id >> 22) % 6`。
+    """
+    return f"https://cdn.discordapp.com/embed/avatars/{(int(user_id) >> 22) % 6}.png"
+
+
+def _resolve_avatar_url(user: Any, user_id: str, size: int) -> str:
+    """从用户对象生成头像地址；用户不可用时回退为默认头像。"""
+    if user is not None:
+        try:
+            return user.display_avatar.with_size(_snap_avatar_size(size)).url
+        except (AttributeError, TypeError, ValueError) as e:
+            logger.debug(f"Discord 解析用户头像失败: {e}")
+    return _default_avatar_url(user_id)
+
+
+def _attachment_to_content(attachment: Any) -> MessageContent:
+    """将附件转换为统一内容（图片/视频/语音/普通文件）。"""
+    major, sep, _ = (attachment.content_type or "").partition("/")
+    media_type = _MIME_MAJOR_CONTENT_TYPES.get(major) if sep else None
+    if media_type is not None:
+        return MessageContent(type=media_type, url=attachment.url)
+    return MessageContent(
+        type=MessageContentType.FILE,
+        url=attachment.url,
+        raw_data={"filename": attachment.filename, "size": attachment.size},
+    )
+
+
+def _embed_to_contents(embed: Any) -> Iterator[MessageContent]:
+    """从 Embed 中提取图片与富文本描述。"""
+    if embed.image:
+        yield MessageContent(type=MessageContentType.IMAGE, url=embed.image.url)
+    if embed.description:
+        yield MessageContent(
+            type=MessageContentType.TEXT, text=f"\n[Embed] {embed.description}"
+        )
+
+
+def _sticker_to_content(sticker: Any) -> MessageContent:
+    """贴纸在逻辑上按图片处理。"""
+    return MessageContent(
+        type=MessageContentType.IMAGE,
+        url=sticker.url,
+        raw_data={"sticker_id": str(sticker.id), "sticker_name": sticker.name},
+    )
+
 
 class DiscordAdapter(PlatformAdapter):
     """
@@ -42,6 +153,9 @@ class DiscordAdapter(PlatformAdapter):
         bot_user_id (str): 机器人自身的 Discord 用户 ID
     """
 
+    # 所有实例共享的 HTTP 会话，复用到 Discord CDN 的连接，避免每次下载重新握手
+    _http_session: aiohttp.ClientSession | None = None
+
     def __init__(self, bot_instance: Any, config: dict | None = None):
         """
         初始化 Discord 适配器。
@@ -53,9 +167,27 @@ class DiscordAdapter(PlatformAdapter):
         super().__init__(bot_instance, config)
         # 机器人自己的用户 ID，用于消息过滤（避免分析博取回复）
         self.bot_user_id = str(config.get("bot_user_id", "")) if config else ""
+        # 整数形式的机器人 ID，消息过滤时直接与 Snowflake 整数比较，省去 str() 转换
+        self._bot_user_id_int = (
+            int(self.bot_user_id) if self.bot_user_id.isdigit() else None
+        )
 
         # 缓存 Discord 客户端（Lazy Loading）
         self._cached_client = None
+        # 客户端的频道查询方法在首次解析客户端时绑定一次，避免每次调用重复探测
+        self._get_channel: Any = None
+        self._fetch_channel: Any = None
+
+        # 频道 ID 字符串到整数的解析缓存
+        self._gid_cache: dict[str, int] = {}
+
+        # 群组元数据 TTL 缓存：key -> (写入时间, 结果)
+        self._group_info_cache: dict[str, tuple[float, UnifiedGroup]] = {}
+        # 列表类结果以不可变元组缓存，可安全共享，对外仍返回新列表
+        self._member_list_cache: dict[str, tuple[float, tuple[UnifiedMember, ...]]] = {}
+        self._group_list_cache: tuple[float, tuple[str, ...]] | None = None
+        # 按缓存键加锁，合并同一群组的并发查询，避免缓存击穿
+        self._cache_locks: defaultdict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
 
     @property
     def _discord_client(self) -> Any:
@@ -72,11 +204,15 @@ class DiscordAdapter(PlatformAdapter):
 
         # 执行路径探测逻辑，兼容不同版本的 AstrBot 宿主结构
         self._cached_client = self._get_discord_client()
+        if self._cached_client:
+            self._get_channel = getattr(self._cached_client, "get_channel", None)
+            self._fetch_channel = getattr(self._cached_client, "fetch_channel", None)
 
         # 兜底：尝试从客户端连接状态中补全机器人 ID
         if not self.bot_user_id and self._cached_client:
             if hasattr(self._cached_client, "user") and self._cached_client.user:
                 self.bot_user_id = str(self._cached_client.user.id)
+                self._bot_user_id_int = int(self._cached_client.user.id)
 
         return self._cached_client
 
@@ -97,6 +233,52 @@ class DiscordAdapter(PlatformAdapter):
         logger.warning(f"无法从 {type(self.bot).__name__} 中提取 Discord 客户端实例")
         return None
 
+    @classmethod
+    def _get_http_session(cls) -> aiohttp.ClientSession:
+        """内部方法：懒加载共享的 HTTP 会话（带连接池与 DNS 缓存）。"""
+        session = cls._http_session
+        if session is None or session.closed:
+            session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=32, ttl_dns_cache=300)
+            )
+            cls._http_session = session
+        return session
+
+    @classmethod
+    async def close_http_session(cls) -> None:
+        """关闭共享的 HTTP 会话，应在插件卸载时调用。"""
+        session, cls._http_session = cls._http_session, None
+        if session is not None and not session.closed:
+            await session.close()
+
+    def _gid(self, group_id: str) -> int:
+        """
+        内部方法：将频道 ID 字符串解析为整数并缓存。
+
+        非法 ID 照常抛出 ValueError；缓存超过上限时按插入顺序淘汰最早的条目。
+        """
+        channel_id = self._gid_cache.get(group_id)
+        if channel_id is None:
+            channel_id = int(group_id)
+            if len(self._gid_cache) >= GID_CACHE_SIZE:
+                self._gid_cache.pop(next(iter(self._gid_cache)))
+            self._gid_cache[group_id] = channel_id
+        return channel_id
+
+    async def _resolve_channel(self, channel_id: int) -> Any:
+        """
+        内部方法：优先从客户端缓存获取频道，未命中时通过网络拉取。
+
+        Returns:
+            Any: Discord 频道对象；客户端不可用时返回 None
+        """
+        if self._get_channel is None and not self._discord_client:
+            return None
+        channel = self._get_channel(channel_id) if self._get_channel else None
+        if not channel and self._fetch_channel:
+            channel = await self._fetch_channel(channel_id)
+        return channel
+
     def _init_capabilities(self) -> PlatformCapabilities:
         """返回预定义的 Discord 平台能力集。"""
         return DISCORD_CAPABILITIES
@@ -123,135 +305,147 @@ class DiscordAdapter(PlatformAdapter):
         Returns:
             list[UnifiedMessage]: 统一格式的消息对象列表
         """
+        messages = [
+            m
+            async for m in self.iter_messages(
+                group_id,
+                days=days,
+                max_count=max_count,
+                before_id=before_id,
+                since_ts=since_ts,
+            )
+        ]
+        # 排序回升序（SDK 可能返回降序）
+        messages.sort(key=lambda m: m.timestamp)
+        return messages
+
+    async def iter_messages(
+        self,
+        group_id: str,
+        days: int = 1,
+        max_count: int = 100,
+        before_id: str | None = None,
+        since_ts: int | None = None,
+    ) -> AsyncIterator[UnifiedMessage]:
+        """
+        以异步生成器形式流式产出 Discord 频道历史消息。
+
+        与 `fetch_messages` 不同，消息随 `channel.history()` 分页到达即被转换并产出，
+        下游可边拉取边处理，峰值内存仅与单页大小相关。产出顺序不保证为升序。
+
+        Args:
+            group_id (str): Discord 频道 (Channel) ID
+            days (int): 查询天数范围
+            max_count (int): 最大拉取消息数量上限
+            before_id (str, optional): 锚点消息 ID，从此之前开始拉取
+            since_ts (int, optional): 起始时间戳，优先于 days
+
+        Yields:
+            UnifiedMessage: 统一格式的消息对象
+        """
         if not discord:
             logger.error("未找到 Discord 模块 (py-cord)，无法拉取历史消息。")
-            return []
+            return
 
         try:
-            channel_id = int(group_id)
-            # 先从缓存尝试获取频道
-            channel = self._discord_client.get_channel(channel_id)
-            if not channel:
-                # 缓存未命中则通过网络 fetch
-                try:
-                    channel = await self._discord_client.fetch_channel(channel_id)
-                except Exception as e:
-                    logger.debug(f"拉取 Discord 频道 {group_id} 失败: {e}")
-                    return []
+            channel_id = self._gid(group_id)
+            try:
+                channel = await self._resolve_channel(channel_id)
+            except _NETWORK_ERRORS as e:
+                logger.debug(f"拉取 Discord 频道 {group_id} 失败: {e}")
+                return
 
             # 验证权限：确保支持历史消息流
             if not hasattr(channel, "history"):
                 logger.warning(f"频道 {group_id} 不支持历史消息访问。")
-                return []
+                return
 
+            # 统一使用带时区的 UTC 时间，与 discord.py 返回的 created_at 直接比较
             if since_ts and since_ts > 0:
-                start_time = datetime.fromtimestamp(since_ts)
+                start_time = datetime.fromtimestamp(since_ts, tz=timezone.utc)
             else:
-                end_time = datetime.now()
-                start_time = end_time - timedelta(days=days)
-
-            messages = []
+                window = _ONE_DAY if days == 1 else timedelta(days=days)
+                start_time = datetime.now(timezone.utc) - window
 
-            # 构建 Discord SDK 的 history 查询参数
-            history_kwargs = {"limit": max_count, "after": start_time}
+            # 以 before 游标显式分页（Discord API 单次上限 100 条），由新到旧拉取
+            cursor = None
             if before_id:
                 try:
                     # 使用 Snowflake ID 指向特定消息
-                    history_kwargs["before"] = discord.Object(id=int(before_id))
+                    cursor = discord.Object(id=int(before_id))
                 except (ValueError, TypeError):
                     pass
 
-            # 消息迭代处理
-            async for msg in channel.history(**history_kwargs):
-                # 排除机器人自身发布的消息
-                if self.bot_user_id and str(msg.author.id) == self.bot_user_id:
-                    continue
-
-                unified = self._convert_message(msg, group_id)
-                if unified:
-                    messages.append(unified)
-
-            # 排序回升序（SDK 通常返回降序）
-            messages.sort(key=lambda m: m.timestamp)
-            return messages
+            bot_uid = self._bot_user_id_int
+            fetched = 0
+            while fetched < max_count:
+                page_limit = min(HISTORY_PAGE_SIZE, max_count - fetched)
+                page = [
+                    msg
+                    async for msg in channel.history(limit=page_limit, before=cursor)
+                ]
+                if not page:
+                    break
+                fetched += len(page)
+
+                # 页内消息由新到旧排列：最旧一条仍在窗口内时整页无需逐条比较时间，
+                # 否则在遇到第一条越界消息时立即停止，后续页只会更旧
+                reached_start = page[-1].created_at < start_time
+                for msg in page:
+                    if reached_start and msg.created_at < start_time:
+                        break
+                    # 排除机器人自身发布的消息（在转换前过滤，避免无效的对象构建）
+                    if bot_uid is not None and msg.author.id == bot_uid:
+                        continue
+
+                    unified = self._convert_message(msg, group_id)
+                    if unified:
+                        yield unified
+
+                # 短页说明已到频道开头，无需再发起一次空请求
+                if reached_start or len(page) < page_limit:
+                    break
+                cursor = discord.Object(id=page[-1].id)
 
         except Exception as e:
             logger.error(f"Discord fetch_messages failed: {e}", exc_info=True)
-            return []
 
-    def _convert_message(self, raw_msg: Any, group_id: str) -> UnifiedMessage | None:
-        """内部方法：将 `discord.Message` 对象转换为统一的 `UnifiedMessage`。"""
+    def _convert_message(
+        self,
+        raw_msg: Any,
+        group_id: str,
+        *,
+        _content=MessageContent,
+        _text_type=MessageContentType.TEXT,
+        _unified=UnifiedMessage,
+    ) -> UnifiedMessage | None:
+        """
+        内部方法：将 `discord.Message` 对象转换为统一的 `UnifiedMessage`。
+
+        该方法在拉取历史时逐条调用，以 `_` 开头的仅限关键字参数在定义时绑定
+        常用类与枚举，使其在函数体内以局部变量访问，调用方不应传入。
+        """
         try:
-            contents = []
+            text = raw_msg.content
+            attachments = raw_msg.attachments
+            embeds = raw_msg.embeds
+            stickers = raw_msg.stickers
 
             # 1. 基础文本
-            if raw_msg.content:
-                contents.append(
-                    MessageContent(type=MessageContentType.TEXT, text=raw_msg.content)
-                )
-
-            # 2. 附件处理 (图片/视频/语音/普通文件)
-            for attachment in raw_msg.attachments:
-                content_type = attachment.content_type or ""
-                if content_type.startswith("image/"):
-                    contents.append(
-                        MessageContent(
-                            type=MessageContentType.IMAGE, url=attachment.url
-                        )
-                    )
-                elif content_type.startswith("video/"):
-                    contents.append(
-                        MessageContent(
-                            type=MessageContentType.VIDEO, url=attachment.url
-                        )
-                    )
-                elif content_type.startswith("audio/"):
-                    contents.append(
-                        MessageContent(
-                            type=MessageContentType.VOICE, url=attachment.url
-                        )
-                    )
-                else:
-                    contents.append(
-                        MessageContent(
-                            type=MessageContentType.FILE,
-                            url=attachment.url,
-                            raw_data={
-                                "filename": attachment.filename,
-                                "size": attachment.size,
-                            },
-                        )
-                    )
-
-            # 3. 嵌入内容处理 (部分 Embed 可能包含富文本描述)
-            for embed in raw_msg.embeds:
-                if embed.image:
-                    contents.append(
-                        MessageContent(
-                            type=MessageContentType.IMAGE, url=embed.image.url
-                        )
-                    )
-                if embed.description:
-                    contents.append(
-                        MessageContent(
-                            type=MessageContentType.TEXT,
-                            text=f"\n[Embed] {embed.description}",
-                        )
-                    )
-
-            # 4. 贴纸处理 (Stickers)
-            if raw_msg.stickers:
-                for sticker in raw_msg.stickers:
-                    contents.append(
-                        MessageContent(
-                            type=MessageContentType.IMAGE,  # 贴纸在逻辑上按图片处理
-                            url=sticker.url,
-                            raw_data={
-                                "sticker_id": str(sticker.id),
-                                "sticker_name": sticker.name,
-                            },
-                        )
+            text_part = (_content(type=_text_type, text=text),) if text else ()
+            if not (attachments or embeds or stickers):
+                # 纯文本消息最为常见，直接使用文本元组
+                contents = text_part
+            else:
+                # 2~4. 附件、嵌入内容与贴纸，经 chain 一次性生成最终元组
+                contents = tuple(
+                    chain(
+                        text_part,
+                        map(_attachment_to_content, attachments),
+                        chain.from_iterable(map(_embed_to_contents, embeds)),
+                        map(_sticker_to_content, stickers or ()),
                     )
+                )
 
             # 确定发送者的显示名称（服务器昵称 > 全局名称 > 用户名）
             sender_card = None
@@ -260,68 +454,90 @@ class DiscordAdapter(PlatformAdapter):
             elif hasattr(raw_msg.author, "global_name") and raw_msg.author.global_name:
                 sender_card = raw_msg.author.global_name
 
-            return UnifiedMessage(
+            return _unified(
                 message_id=str(raw_msg.id),
                 sender_id=str(raw_msg.author.id),
                 sender_name=raw_msg.author.name,
                 sender_card=sender_card,
                 group_id=group_id,
                 text_content=raw_msg.content,
-                contents=tuple(contents),
+                contents=contents,
                 timestamp=int(raw_msg.created_at.timestamp()),
-                platform="discord",
+                platform=PLATFORM_NAME,
                 reply_to_id=str(raw_msg.reference.message_id)
                 if raw_msg.reference
                 else None,
             )
-        except Exception as e:
+        except (AttributeError, TypeError, ValueError, KeyError) as e:
+            # 仅吞掉消息结构不完整导致的错误，编程错误应直接暴露
             logger.debug(f"Discord 消息转换错误: {e}")
             return None
 
-    def convert_to_raw_format(self, messages: list[UnifiedMessage]) -> list[dict]:
+    def convert_to_raw_format(
+        self, messages: list[UnifiedMessage]
+    ) -> list[dict[str, Any]]:
         """将统一格式降级转换为 OneBot 风格的字典，以适配下游组件。"""
-        raw_messages = []
-        for msg in messages:
-            raw_msg = {
-                "message_id": msg.message_id,
-                "group_id": msg.group_id,
-                "time": msg.timestamp,
-                "sender": {
-                    "user_id": msg.sender_id,
-                    "nickname": msg.sender_name,
-                    "card": msg.sender_card,
-                },
-                "message": [],
-                "user_id": msg.sender_id,  # 后向兼容
-            }
-
-            for content in msg.contents:
-                if content.type == MessageContentType.TEXT:
-                    raw_msg["message"].append(
-                        {"type": "text", "data": {"text": content.text or ""}}
-                    )
-                elif content.type == MessageContentType.IMAGE:
-                    raw_msg["message"].append(
+        return [self._msg_to_raw_dict(msg) for msg in messages]
+
+    def convert_to_raw_json_bytes(self, messages: list[UnifiedMessage]) -> bytes:
+        """
+        将统一格式直接序列化为 OneBot 风格的 JSON 数组字节串。
+
+        适用于最终只需要 JSON 的下游（如 LLM 输入、导出）：逐条构建并立即编码，
+        同一时刻只存在一条消息的中间字典，避免先物化完整的字典列表。
+        """
+        encode = _RAW_JSON_ENCODER.encode
+        to_raw = self._msg_to_raw_dict
+        body = ",".join(encode(to_raw(msg)) for msg in messages)
+        return f"[{body}]".encode()
+
+    @staticmethod
+    def _msg_to_raw_dict(msg: UnifiedMessage) -> dict[str, Any]:
+        """内部方法：将单条统一消息转换为 OneBot 风格字典。"""
+        text_type = MessageContentType.TEXT
+        image_type = MessageContentType.IMAGE
+        at_type = MessageContentType.AT
+        reply_type = MessageContentType.REPLY
+
+        segments: list[dict[str, Any]] = []
+        for content in msg.contents:
+            ctype = content.type
+            if ctype is text_type:
+                segments.append({"type": "text", "data": {"text": content.text or ""}})
+            elif ctype is image_type:
+                segments.append(
+                    {
+                        "type": "image",
+                        "data": {"url": content.url, "file": content.url},
+                    }
+                )
+            elif ctype is at_type:
+                segments.append({"type": "at", "data": {"qq": content.at_user_id}})
+            elif ctype is reply_type:
+                if content.raw_data and "reply_id" in content.raw_data:
+                    segments.append(
                         {
-                            "type": "image",
-                            "data": {"url": content.url, "file": content.url},
+                            "type": "reply",
+                            "data": {"id": content.raw_data["reply_id"]},
                         }
                     )
-                elif content.type == MessageContentType.AT:
-                    raw_msg["message"].append(
-                        {"type": "at", "data": {"qq": content.at_user_id}}
-                    )
-                elif content.type == MessageContentType.REPLY:
-                    if content.raw_data and "reply_id" in content.raw_data:
-                        raw_msg["message"].append(
-                            {
-                                "type": "reply",
-                                "data": {"id": content.raw_data["reply_id"]},
-                            }
-                        )
-
-            raw_messages.append(raw_msg)
-        return raw_messages
+
+        # 通过 C 实现的 attrgetter 一次取出全部字段，再以单个字典字面量构建
+        message_id, group_id, timestamp, sender_id, sender_name, sender_card = (
+            _RAW_MSG_FIELDS(msg)
+        )
+        return {
+            "message_id": message_id,
+            "group_id": group_id,
+            "time": timestamp,
+            "sender": {
+                "user_id": sender_id,
+                "nickname": sender_name,
+                "card": sender_card,
+            },
+            "message": segments,
+            "user_id": sender_id,  # 后向兼容
+        }
 
     # ==================== IMessageSender 实现 ====================
 
@@ -346,10 +562,8 @@ class DiscordAdapter(PlatformAdapter):
             return False
 
         try:
-            channel_id = int(group_id)
-            channel = self.bot.get_channel(channel_id)
-            if not channel:
-                channel = await self.bot.fetch_channel(channel_id)
+            channel_id = self._gid(group_id)
+            channel = await self._resolve_channel(channel_id)
 
             if not hasattr(channel, "send"):
                 return False
@@ -392,10 +606,8 @@ class DiscordAdapter(PlatformAdapter):
             return False
 
         try:
-            channel_id = int(group_id)
-            channel = self._discord_client.get_channel(channel_id)
-            if not channel:
-                channel = await self._discord_client.fetch_channel(channel_id)
+            channel_id = self._gid(group_id)
+            channel = await self._resolve_channel(channel_id)
 
             if not hasattr(channel, "send"):
                 return False
@@ -403,7 +615,6 @@ class DiscordAdapter(PlatformAdapter):
             file_to_send = None
             if image_path.startswith("base64://"):
                 # Base64 图片：解码 -> 内存 Object -> Discord
-                import base64  # Fix: Ensure base64 is imported
                 from io import BytesIO
 
                 try:
@@ -420,34 +631,29 @@ class DiscordAdapter(PlatformAdapter):
                 # 远程图片：下载 -> 内存 Object -> Discord
                 from io import BytesIO
 
-                import aiohttp
-
                 try:
-                    async with aiohttp.ClientSession() as session:
-                        async with session.get(
-                            image_path, timeout=aiohttp.ClientTimeout(total=30)
-                        ) as resp:
-                            if resp.status == 200:
-                                data = await resp.read()
-                                # 尽量保留原始后缀
-                                filename = image_path.split("/")[-1].split("?")[0]
-                                if not filename.lower().endswith(
-                                    (".png", ".jpg", ".jpeg", ".gif", ".webp")
-                                ):
-                                    filename = "daily_report_image.png"
-
-                                file_to_send = discord.File(
-                                    BytesIO(data), filename=filename
-                                )
-                            else:
-                                # 兜底：如果下载失败，直接发 URL 给 Discord 尝试自动解析
-                                content = (
-                                    f"{caption}\n{image_path}"
-                                    if caption
-                                    else image_path
-                                )
-                                await channel.send(content=content)
-                                return True
+                    async with self._get_http_session().get(
+                        image_path, timeout=aiohttp.ClientTimeout(total=30)
+                    ) as resp:
+                        if resp.status == 200:
+                            data = await resp.read()
+                            # 尽量保留原始后缀
+                            filename = image_path.split("/")[-1].split("?")[0]
+                            if not filename.lower().endswith(
+                                (".png", ".jpg", ".jpeg", ".gif", ".webp")
+                            ):
+                                filename = "daily_report_image.png"
+
+                            file_to_send = discord.File(
+                                BytesIO(data), filename=filename
+                            )
+                        else:
+                            # 兜底：如果下载失败，直接发 URL 给 Discord 尝试自动解析
+                            content = (
+                                f"{caption}\n{image_path}" if caption else image_path
+                            )
+                            await channel.send(content=content)
+                            return True
                 except Exception as de:
                     logger.warning(
                         f"Discord 远程图片下载失败: {de}，将回退为发送 URL。"
@@ -478,10 +684,8 @@ class DiscordAdapter(PlatformAdapter):
             return False
 
         try:
-            channel_id = int(group_id)
-            channel = self.bot.get_channel(channel_id)
-            if not channel:
-                channel = await self.bot.fetch_channel(channel_id)
+            channel_id = self._gid(group_id)
+            channel = await self._resolve_channel(channel_id)
 
             if not hasattr(channel, "send"):
                 return False
@@ -507,10 +711,8 @@ class DiscordAdapter(PlatformAdapter):
             return False
 
         try:
-            channel_id = int(group_id)
-            channel = self._discord_client.get_channel(channel_id)
-            if not channel:
-                channel = await self._discord_client.fetch_channel(channel_id)
+            channel_id = self._gid(group_id)
+            channel = await self._resolve_channel(channel_id)
 
             if not hasattr(channel, "send"):
                 return False
@@ -542,16 +744,45 @@ class DiscordAdapter(PlatformAdapter):
 
     # ==================== IGroupInfoRepository 实现 ====================
 
+    def invalidate_cache(self, group_id: str | None = None) -> None:
+        """
+        使群组元数据缓存失效，用于显式刷新。
+
+        Args:
+            group_id (str, optional): 指定群组 ID；为空时清空全部缓存
+        """
+        if group_id is None:
+            self._group_info_cache.clear()
+            self._member_list_cache.clear()
+        else:
+            self._group_info_cache.pop(str(group_id), None)
+            self._member_list_cache.pop(str(group_id), None)
+        self._group_list_cache = None
+
     async def get_group_info(self, group_id: str) -> UnifiedGroup | None:
-        """解析 Discord 频道及所属服务器的基本信息。"""
+        """解析 Discord 频道及所属服务器的基本信息（带 TTL 缓存）。"""
         if not discord:
             return None
 
+        group_id = str(group_id)
+        cached = self._group_info_cache.get(group_id)
+        if cached and time.monotonic() - cached[0] < GROUP_CACHE_TTL:
+            return cached[1]
+
+        async with self._cache_locks[f"info:{group_id}"]:
+            cached = self._group_info_cache.get(group_id)
+            if cached and time.monotonic() - cached[0] < GROUP_CACHE_TTL:
+                return cached[1]
+            info = await self._fetch_group_info(group_id)
+            if info is not None:
+                self._group_info_cache[group_id] = (time.monotonic(), info)
+            return info
+
+    async def _fetch_group_info(self, group_id: str) -> UnifiedGroup | None:
+        """内部方法：实际查询频道及所属服务器的基本信息。"""
         try:
-            channel_id = int(group_id)
-            channel = self.bot.get_channel(channel_id)
-            if not channel:
-                channel = await self.bot.fetch_channel(channel_id)
+            channel_id = self._gid(group_id)
+            channel = await self._resolve_channel(channel_id)
 
             guild = getattr(channel, "guild", None)
             group_name = getattr(channel, "name", str(channel.id))
@@ -571,17 +802,28 @@ class DiscordAdapter(PlatformAdapter):
                 member_count=member_count,
                 owner_id=owner_id or None,
                 create_time=int(channel.created_at.timestamp()),
-                platform="discord",
+                platform=PLATFORM_NAME,
             )
         except Exception as e:
             logger.debug(f"Discord 获取群组信息错误: {e}")
             return None
 
     async def get_group_list(self) -> list[str]:
-        """列出机器人所在服务器中所有可访问的文本频道 ID。"""
+        """列出机器人所在服务器中所有可访问的文本频道 ID（带 TTL 缓存）。"""
         if not discord:
             return []
 
+        cached = self._group_list_cache
+        if cached and time.monotonic() - cached[0] < GROUP_CACHE_TTL:
+            return list(cached[1])
+
+        channel_ids = self._fetch_group_list()
+        if channel_ids:
+            self._group_list_cache = (time.monotonic(), tuple(channel_ids))
+        return channel_ids
+
+    def _fetch_group_list(self) -> list[str]:
+        """内部方法：遍历客户端缓存中的服务器，收集文本频道 ID。"""
         try:
             channel_ids = []
             for guild in self._discord_client.guilds:
@@ -596,15 +838,30 @@ class DiscordAdapter(PlatformAdapter):
         获取频道对应的成员列表。
 
         注意：对于大型服务器，建议启用 GUILD_MEMBERS 意图以保证列表完整性。
+        结果在 TTL 内缓存复用，可通过 `invalidate_cache` 显式刷新。
         """
         if not discord:
             return []
 
+        group_id = str(group_id)
+        cached = self._member_list_cache.get(group_id)
+        if cached and time.monotonic() - cached[0] < GROUP_CACHE_TTL:
+            return list(cached[1])
+
+        async with self._cache_locks[f"members:{group_id}"]:
+            cached = self._member_list_cache.get(group_id)
+            if cached and time.monotonic() - cached[0] < GROUP_CACHE_TTL:
+                return list(cached[1])
+            members = await self._fetch_member_list(group_id)
+            if members:
+                self._member_list_cache[group_id] = (time.monotonic(), tuple(members))
+            return members
+
+    async def _fetch_member_list(self, group_id: str) -> list[UnifiedMember]:
+        """内部方法：实际查询频道对应的成员列表。"""
         try:
-            channel_id = int(group_id)
-            channel = self.bot.get_channel(channel_id)
-            if not channel:
-                channel = await self.bot.fetch_channel(channel_id)
+            channel_id = self._gid(group_id)
+            channel = await self._resolve_channel(channel_id)
 
             guild = getattr(channel, "guild", None)
             if not guild:
@@ -653,10 +910,8 @@ class DiscordAdapter(PlatformAdapter):
 
         try:
             uid = int(user_id)
-            channel_id = int(group_id)
-            channel = self.bot.get_channel(channel_id)
-            if not channel:
-                channel = await self.bot.fetch_channel(channel_id)
+            channel_id = self._gid(group_id)
+            channel = await self._resolve_channel(channel_id)
 
             guild = getattr(channel, "guild", None)
             if not guild:
@@ -699,29 +954,41 @@ class DiscordAdapter(PlatformAdapter):
         if not discord or not self._discord_client:
             return None
 
-        try:
-            uid = int(user_id)
-            user = self._discord_client.get_user(
-                uid
-            ) or await self._discord_client.fetch_user(uid)
-
-            if user:
-                # 自动对齐 Discord 支持的尺寸 (2的幂)
-                allowed_sizes = (16, 32, 64, 128, 256, 512, 1024, 2048, 4096)
-                target_size = min(allowed_sizes, key=lambda x: abs(x - size))
-                return user.display_avatar.with_size(target_size).url
-
-            return None
-        except Exception as e:
-            logger.debug(f"Discord 获取用户头像 URL 错误: {e}")
+        user_id = str(user_id)
+        if not user_id.isdigit():
             return None
 
+        client = self._discord_client
+        user = client.get_user(int(user_id))
+        if user is None:
+            try:
+                user = await client.fetch_user(int(user_id))
+            except _NETWORK_ERRORS as e:
+                logger.debug(f"Discord 获取用户头像 URL 错误: {e}")
+                user = None
+        return _resolve_avatar_url(user, user_id, size)
+
     async def get_user_avatar_data(
         self,
         user_id: str,
         size: int = 100,
     ) -> str | None:
-        """暂不提供 Base64 转换服务，优先使用 CDN 链接。"""
+        """通过共享 HTTP 会话下载头像并转换为 Base64 Data URI。"""
+        url = await self.get_user_avatar_url(user_id, size)
+        if not url:
+            return None
+
+        try:
+            async with self._get_http_session().get(
+                url, timeout=aiohttp.ClientTimeout(total=5)
+            ) as resp:
+                if resp.status == 200:
+                    data = await resp.read()
+                    b64 = base64.b64encode(data).decode("utf-8")
+                    content_type = resp.headers.get("Content-Type", "image/png")
+                    return f"data:{content_type};base64,{b64}"
+        except Exception as e:
+            logger.debug(f"Discord 头像下载失败: {e}")
         return None
 
     async def get_group_avatar_url(
@@ -734,14 +1001,10 @@ class DiscordAdapter(PlatformAdapter):
             return None
 
         try:
-            channel = self.bot.get_channel(
-                int(group_id)
-            ) or await self.bot.fetch_channel(int(group_id))
+            channel = await self._resolve_channel(self._gid(group_id))
             guild = getattr(channel, "guild", None)
             if guild and guild.icon:
-                allowed_sizes = (16, 32, 64, 128, 256, 512, 1024, 2048, 4096)
-                target_size = min(allowed_sizes, key=lambda x: abs(x - size))
-                return guild.icon.with_size(target_size).url
+                return guild.icon.with_size(_snap_avatar_size(size)).url
             return None
         except Exception:
             return None
@@ -751,8 +1014,45 @@ class DiscordAdapter(PlatformAdapter):
         user_ids: list[str],
         size: int = 100,
     ) -> dict[str, str | None]:
-        """批量获取头像的最佳实践。"""
-        return {uid: await self.get_user_avatar_url(uid, size) for uid in user_ids}
+        """
+        批量获取头像的最佳实践。
+
+        命中客户端本地缓存的用户直接同步生成地址，不再为每个用户创建协程；
+        仅对缓存未命中的用户回退到 `get_user_avatar_url`，并以有界并发走网络查询。
+        """
+        if not user_ids:
+            return {}
+        if not discord or not self._discord_client:
+            return dict.fromkeys(user_ids)
+
+        get_user = self._discord_client.get_user
+        result: dict[str, str | None] = {}
+        misses: list[str] = []
+        for uid in user_ids:
+            uid = str(uid)
+            if not uid.isdigit():
+                result[uid] = None
+                continue
+            user = get_user(int(uid))
+            if user is None:
+                misses.append(uid)
+            else:
+                result[uid] = _resolve_avatar_url(user, uid, size)
+
+        if misses:
+            # 未命中缓存的用户需走网络查询，有界并发以遵守 Discord 的路由限流
+            semaphore = asyncio.Semaphore(AVATAR_FETCH_CONCURRENCY)
+
+            async def _fetch_avatar(uid: str) -> tuple[str, str | None]:
+                async with semaphore:
+                    try:
+                        return uid, await self.get_user_avatar_url(uid, size)
+                    except Exception as e:
+                        logger.debug(f"Discord 批量获取头像失败 uid={uid}: {e}")
+                        return uid, None
+
+            result.update(await asyncio.gather(*(_fetch_avatar(uid) for uid in misses)))
+        return result
 
     async def set_reaction(
         self, group_id: str, message_id: str, emoji: str | int, is_add: bool = True
@@ -773,10 +1073,8 @@ class DiscordAdapter(PlatformAdapter):
                 "424": "📊",
             }.get(reaction_key, reaction_key)
 
-            channel_id = int(group_id)
-            channel = self._discord_client.get_channel(channel_id)
-            if not channel:
-                channel = await self._discord_client.fetch_channel(channel_id)
+            channel_id = self._gid(group_id)
+            channel = await self._resolve_channel(channel_id)
 
             if not hasattr(channel, "get_partial_message"):
                 # 如果较低版本的 SDK 没这个方法，则直接 fetch
@@ -6,10 +6,16 @@ OneBot v11 平台适配器
 
 import asyncio
 import base64
+import bisect
+import functools
+import itertools
 import os
 import time
+from collections import OrderedDict, defaultdict
+from collections.abc import Awaitable, Callable
 from datetime import datetime, timedelta
-from typing import Any
+from operator import attrgetter
+from typing import Any, ClassVar
 
 import aiohttp
 
@@ -26,6 +32,208 @@ from ....domain.value_objects.unified_message import (
 from ....utils.logger import logger
 from ..base import PlatformAdapter
 
+# 可选加速依赖：pybase64 提供 SIMD 加速的 Base64 编码，接口与标准库一致
+try:
+    from pybase64 import b64encode as _b64encode
+except ImportError:
+    _b64encode = base64.b64encode
+
+
+@functools.lru_cache(maxsize=4096)
+def _to_int(value: str | int) -> int:
+    """将群号/QQ 号转换为整数（同一适配器反复使用的 ID 数量有限，结果缓存复用）。"""
+    return int(value)
+
+
+def _msg_time(raw_msg: dict) -> int:
+    """提取 OneBot 原始消息的时间戳，缺失时视为 0。"""
+    return raw_msg.get("time", 0)
+
+
+def _seg_text(seg_data: dict, seg_type: str) -> MessageContent:
+    return MessageContent(type=MessageContentType.TEXT, text=seg_data.get("text", ""))
+
+
+def _seg_image(seg_data: dict, seg_type: str) -> MessageContent:
+    # QQ 平台: subType=1 表示表情包，通过 raw_data 传递给下游统计
+    sub_type = seg_data.get("subType", seg_data.get("sub_type"))
+    raw_data: dict[str, Any] = {"summary": seg_data.get("summary", "")}
+    # 安全地转换为整数，只在 sub_type 有效时包含在 raw_data 中
+    try:
+        sub_type_int = int(sub_type)
+    except (TypeError, ValueError):
+        sub_type_int = None
+    if sub_type_int is not None:
+        raw_data["sub_type"] = sub_type_int
+    return MessageContent(
+        type=MessageContentType.EMOJI
+        if sub_type_int == 1
+        else MessageContentType.IMAGE,
+        url=seg_data.get("url", seg_data.get("file", "")),
+        raw_data=raw_data,
+    )
+
+
+def _seg_at(seg_data: dict, seg_type: str) -> MessageContent:
+    return MessageContent(
+        type=MessageContentType.AT, at_user_id=str(seg_data.get("qq", ""))
+    )
+
+
+def _seg_face(seg_data: dict, seg_type: str) -> MessageContent:
+    return MessageContent(
+        type=MessageContentType.EMOJI,
+        emoji_id=str(seg_data.get("id", "")),
+        raw_data={"face_type": seg_type},
+    )
+
+
+def _seg_reply(seg_data: dict, seg_type: str) -> MessageContent:
+    return MessageContent(
+        type=MessageContentType.REPLY, raw_data={"reply_id": seg_data.get("id", "")}
+    )
+
+
+def _seg_forward(seg_data: dict, seg_type: str) -> MessageContent:
+    return MessageContent(type=MessageContentType.FORWARD, raw_data=seg_data)
+
+
+def _seg_record(seg_data: dict, seg_type: str) -> MessageContent:
+    return MessageContent(
+        type=MessageContentType.VOICE,
+        url=seg_data.get("url", seg_data.get("file", "")),
+    )
+
+
+def _seg_video(seg_data: dict, seg_type: str) -> MessageContent:
+    return MessageContent(
+        type=MessageContentType.VIDEO,
+        url=seg_data.get("url", seg_data.get("file", "")),
+    )
+
+
+# OneBot 消息段类型 -> 统一内容构建函数，未列出的类型按 UNKNOWN 保留原始段
+_SEGMENT_BUILDERS = {
+    "text": _seg_text,
+    "image": _seg_image,
+    "at": _seg_at,
+    "face": _seg_face,
+    "mface": _seg_face,
+    "bface": _seg_face,
+    "sface": _seg_face,
+    "reply": _seg_reply,
+    "forward": _seg_forward,
+    "record": _seg_record,
+    "video": _seg_video,
+}
+
+
+def _raw_text(content: MessageContent) -> dict:
+    return {"type": "text", "data": {"text": content.text or ""}}
+
+
+def _raw_image(content: MessageContent) -> dict:
+    return {"type": "image", "data": {"url": content.url or ""}}
+
+
+def _raw_at(content: MessageContent) -> dict:
+    return {"type": "at", "data": {"qq": content.at_user_id or ""}}
+
+
+def _raw_emoji(content: MessageContent) -> dict:
+    face_type = (
+        content.raw_data.get("face_type", "face") if content.raw_data else "face"
+    )
+    return {"type": face_type, "data": {"id": content.emoji_id or ""}}
+
+
+def _raw_reply(content: MessageContent) -> dict:
+    reply_id = content.raw_data.get("reply_id", "") if content.raw_data else ""
+    return {"type": "reply", "data": {"id": reply_id}}
+
+
+def _raw_forward(content: MessageContent) -> dict:
+    return {"type": "forward", "data": content.raw_data or {}}
+
+
+def _raw_voice(content: MessageContent) -> dict:
+    return {"type": "record", "data": {"url": content.url or ""}}
+
+
+def _raw_video(content: MessageContent) -> dict:
+    return {"type": "video", "data": {"url": content.url or ""}}
+
+
+# 统一内容类型 -> OneBot 消息段构建函数（UNKNOWN 类型直接回填原始段）
+_RAW_SEGMENT_BUILDERS = {
+    MessageContentType.TEXT: _raw_text,
+    MessageContentType.IMAGE: _raw_image,
+    MessageContentType.AT: _raw_at,
+    MessageContentType.EMOJI: _raw_emoji,
+    MessageContentType.REPLY: _raw_reply,
+    MessageContentType.FORWARD: _raw_forward,
+    MessageContentType.VOICE: _raw_voice,
+    MessageContentType.VIDEO: _raw_video,
+}
+
+
+# 流式 Base64 编码的读取块大小（57 KiB，须为 3 的倍数）
+BASE64_CHUNK_SIZE = 57 * 1024
+
+# 头像 Base64 数据缓存：最大条目数与有效期（秒）
+AVATAR_DATA_CACHE_SIZE = 2048
+AVATAR_DATA_CACHE_TTL = 3600
+
+# 群相册 / 群文件夹列表缓存有效期（秒）
+GROUP_METADATA_CACHE_TTL = 120.0
+
+# 判定协议端不支持相册上传后，暂停尝试的时长（秒）；到期后重新探测
+ALBUM_UNSUPPORTED_TTL = 1800.0
+
+# OneBot 标准的“API 不存在”返回码
+_UNSUPPORTED_ACTION_RETCODE = 1404
+
+# 协议端“接口不存在 / 不支持”类错误在 wording/message 字段中的特征。
+# 只匹配结构化的错误描述字段，不匹配 str(e)：后者包含 echo、群号与消息内容，易误判。
+# 注意不能匹配泛化的 "not found"，协议端读不到本地文件时也会这样报错，此时正需要 Base64 补救
+_UNSUPPORTED_ACTION_KEYWORDS = (
+    "api not found",
+    "action not found",
+    "unknown action",
+    "not support",
+    "unsupported",
+    "不支持",
+)
+
+
+def _extract_album_list(payload: Any) -> list[dict]:
+    """从不同结构的响应中提取相册列表：直接列表、嵌套在 data 中、或直接在根字段中。"""
+    if isinstance(payload, list):
+        album_list = payload
+    elif isinstance(payload, dict):
+        album_list = None
+        data = payload.get("data")
+        if isinstance(data, dict):
+            album_list = data.get("album_list") or data.get("list")
+            if not isinstance(album_list, list):
+                logger.debug(f"[群分析相册] 在 data 字段中未找到列表: data={data}")
+        if not isinstance(album_list, list):
+            album_list = payload.get("album_list") or payload.get("list")
+        if not isinstance(album_list, list):
+            logger.debug(f"[群分析相册] 无法从响应中提取相册列表: payload={payload}")
+            return []
+    else:
+        logger.debug(
+            f"[群分析相册] 提取相册列表失败: payload 非字典/列表类型 ({type(payload)})"
+        )
+        return []
+
+    return [item for item in album_list if isinstance(item, dict)]
+
+
+class _UnsupportedActionError(RuntimeError):
+    """协议端不支持所需 API，换用任何传输模式重试都不会成功。"""
+
 
 class OneBotAdapter(PlatformAdapter):
     """
@@ -41,7 +249,7 @@ class OneBotAdapter(PlatformAdapter):
 
     platform_name = "onebot"
 
-    # QQ 头像服务 URL 模板
+    # QQ 头像服务 URL 模板（热路径中以等价的 f-string 直接拼接，避免 str.format 解析开销）
     USER_AVATAR_TEMPLATE = "https://q1.qlogo.cn/g?b=qq&nk={user_id}&s={size}"
     USER_AVATAR_HD_TEMPLATE = (
         "https://q.qlogo.cn/headimg_dl?dst_uin={user_id}&spec={size}&img_type=jpg"
@@ -50,6 +258,17 @@ class OneBotAdapter(PlatformAdapter):
 
     # OneBot 服务支持的头像尺寸像素
     AVAILABLE_SIZES = (40, 100, 140, 160, 640)
+    # 相邻尺寸的中点，用于二分定位最接近的尺寸（恰在中点时取较小者）
+    _SIZE_THRESHOLDS = tuple(
+        (a + b) / 2 for a, b in itertools.pairwise(AVAILABLE_SIZES)
+    )
+    # 群头像 URL 按尺寸预先生成的后缀
+    _GROUP_AVATAR_SUFFIXES: ClassVar[dict[int, str]] = {
+        s: f"/{s}/" for s in AVAILABLE_SIZES
+    }
+
+    # 所有实例共享的 HTTP 会话，复用到 QQ 头像服务的连接，避免每次下载重新握手
+    _http_session: aiohttp.ClientSession | None = None
 
     def __init__(self, bot_instance: Any, config: dict | None = None):
         """
@@ -78,6 +297,57 @@ class OneBotAdapter(PlatformAdapter):
         self._muted_groups_cache = {}
         # 群角色缓存 (group_id -> (role, timestamp))，用于 get_group_member_info 超时降级
         self._group_role_cache: dict[str, tuple[str, float]] = {}
+        # 头像数据缓存 ((user_id, size) -> (写入时间, data URI))，按 LRU 淘汰
+        self._avatar_cache: OrderedDict[tuple[str, int], tuple[float, str]] = (
+            OrderedDict()
+        )
+        # 群相册 / 群文件夹列表缓存 (group_id -> (写入时间, 列表))
+        self._album_cache: dict[str, tuple[float, list[dict]]] = {}
+        self._folder_cache: dict[str, tuple[float, list[dict]]] = {}
+        # 已探测成功的相册列表 / 相册上传 API 名称，后续调用直接使用
+        self._preferred_album_api: str | None = None
+        self._preferred_album_upload_api: str | None = None
+        # 协议端确认不支持相册上传后记录的截止时刻（monotonic），期间不再尝试
+        self._album_unsupported_until = 0.0
+        # 按 (类别, group_id) 加锁，合并并发请求为一次 RPC
+        self._metadata_locks: defaultdict[tuple[str, str], asyncio.Lock] = defaultdict(
+            asyncio.Lock
+        )
+
+    @classmethod
+    def _get_http_session(cls) -> aiohttp.ClientSession:
+        """内部方法：懒加载共享的 HTTP 会话（带连接池与 DNS 缓存）。"""
+        session = cls._http_session
+        if session is None or session.closed:
+            session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=100,
+                    limit_per_host=10,
+                    ttl_dns_cache=300,
+                    enable_cleanup_closed=True,
+                ),
+                timeout=aiohttp.ClientTimeout(total=5),
+            )
+            cls._http_session = session
+        return session
+
+    @classmethod
+    async def close_http_session(cls) -> None:
+        """关闭共享的 HTTP 会话，应在插件卸载时调用。"""
+        session, cls._http_session = cls._http_session, None
+        if session is not None and not session.closed:
+            await session.close()
+
+    @property
+    def bot_self_ids(self) -> list[str]:
+        """机器人自身的 QQ 号列表（保持配置顺序）。"""
+        return self._bot_self_ids
+
+    @bot_self_ids.setter
+    def bot_self_ids(self, value: list[str] | None) -> None:
+        # 同步维护一份 frozenset，逐条消息过滤时以 O(1) 判断成员
+        self._bot_self_ids = list(value or [])
+        self._bot_self_id_set = frozenset(str(uid) for uid in self._bot_self_ids)
 
     def _init_capabilities(self) -> PlatformCapabilities:
         """返回预定义的 OneBot v11 能力集。"""
@@ -121,7 +391,9 @@ class OneBotAdapter(PlatformAdapter):
 
     def _get_nearest_size(self, requested_size: int) -> int:
         """从支持的尺寸列表中找到最接近请求尺寸的一个。"""
-        return min(self.AVAILABLE_SIZES, key=lambda x: abs(x - requested_size))
+        return self.AVAILABLE_SIZES[
+            bisect.bisect_left(self._SIZE_THRESHOLDS, requested_size)
+        ]
 
     # ==================== IMessageRepository 实现 ====================
 
@@ -156,11 +428,12 @@ class OneBotAdapter(PlatformAdapter):
             chunk_size = 100  # 每次拉取 100 条，较为稳健
             all_raw_messages = []
 
-            # 确定回溯的起始时间点
+            # 确定回溯的时间窗口（结束时间点在循环外计算一次）
+            end_time_dt = datetime.now()
+            end_timestamp = int(end_time_dt.timestamp())
             if since_ts and since_ts > 0:
                 start_timestamp = since_ts
             else:
-                end_time_dt = datetime.now()
                 start_time_dt = end_time_dt - timedelta(days=days)
                 start_timestamp = int(start_time_dt.timestamp())
 
@@ -173,122 +446,144 @@ class OneBotAdapter(PlatformAdapter):
                 f"上限 {max_count} 条"
             )
 
-            while len(all_raw_messages) < max_count:
-                fetch_count = min(chunk_size, max_count - len(all_raw_messages))
-
-                params: dict[str, int | str | bool | None] = {
-                    "group_id": int(group_id),
-                    "count": fetch_count,
-                }
-                if self._is_snowluma:
-                    if current_anchor_id:
-                        params["message_id"] = current_anchor_id
-                else:
-                    params["reverseOrder"] = True
-                    if current_anchor_id:
-                        params["message_seq"] = current_anchor_id
+            bot_id_set = self._bot_self_id_set
+            seen_ids: set[str] = set()
+            unified_messages = []
 
-                result = await self.bot.call_action("get_group_msg_history", **params)
+            # 流水线分页：本页过滤完成后立即发起下一页请求（节流延迟在请求任务内执行），
+            # 本页消息的转换与下一页的网络等待并发进行
+            requested_count = min(chunk_size, max_count)
+            # 后端此前单页返回的最大条数（部分实现如 go-cqhttp 会忽略 count 固定返回少量消息）
+            largest_page = 0
+            pending = asyncio.create_task(
+                self._fetch_history_page(group_id, current_anchor_id, requested_count)
+            )
+            try:
+                while pending is not None:
+                    result = await pending
+                    pending = None
 
-                if not result or "messages" not in result:
-                    logger.debug(
-                        f"OneBot 分页拉取：API 调用返回空或无效数据，停止回溯。群: {group_id}"
-                    )
-                    break
+                    if not result or "messages" not in result:
+                        logger.debug(
+                            f"OneBot 分页拉取：API 调用返回空或无效数据，停止回溯。群: {group_id}"
+                        )
+                        break
 
-                messages = result.get("messages", [])
-                if not messages:
-                    logger.debug(
-                        f"OneBot 分页拉取：获取到 0 条消息，停止回溯。群: {group_id}"
+                    messages = result.get("messages", [])
+                    if not messages:
+                        logger.debug(
+                            f"OneBot 分页拉取：获取到 0 条消息，停止回溯。群: {group_id}"
+                        )
+                        break
+
+                    # 确定该批次中最旧的消息作为下一次回溯的起点
+                    # 不同 OneBot 实现对 reverseOrder 的处理可能导致结果顺序不同（反映在消息时间戳上）
+                    # 我们通过比较首尾消息的时间戳，动态识别出本批次中最旧的消息
+                    first_msg = messages[0]
+                    last_msg = messages[-1]
+                    if first_msg.get("time", 0) <= last_msg.get("time", 0):
+                        # 正序：首条消息最旧
+                        chunk_earliest_msg = first_msg
+                    else:
+                        # 逆序：末条消息最旧
+                        chunk_earliest_msg = last_msg
+
+                    chunk_earliest_time = chunk_earliest_msg.get("time", 0)
+
+                    # 返回条数少于请求数，且少于后端此前能给出的单页条数，视为历史已到尽头
+                    history_exhausted = len(messages) < min(
+                        requested_count, largest_page
                     )
-                    break
-
-                # 确定该批次中最旧的消息作为下一次回溯的起点
-                # 不同 OneBot 实现对 reverseOrder 的处理可能导致结果顺序不同（反映在消息时间戳上）
-                # 我们通过比较首尾消息的时间戳，动态识别出本批次中最旧的消息
-                first_msg = messages[0]
-                last_msg = messages[-1]
-                if first_msg.get("time", 0) <= last_msg.get("time", 0):
-                    # 正序：首条消息最旧
-                    chunk_earliest_msg = first_msg
-                else:
-                    # 逆序：末条消息最旧
-                    chunk_earliest_msg = last_msg
-
-                chunk_earliest_time = chunk_earliest_msg.get("time", 0)
-
-                for raw_msg in messages:
-                    msg_time = raw_msg.get("time", 0)
-                    msg_id = str(raw_msg.get("message_id", ""))
+                    largest_page = max(largest_page, len(messages))
+
+                    # 时间范围判定：按时间排序后二分定位窗口边界，只遍历窗口内的消息
+                    # （后端返回的批次本身有序，Timsort 对正序/逆序输入均为线性）
+                    ordered = sorted(messages, key=_msg_time)
+                    times = list(map(_msg_time, ordered))
+                    lo = bisect.bisect_left(times, start_timestamp)
+                    hi = bisect.bisect_right(times, end_timestamp)
+
+                    page_raw_messages = []
+                    for raw_msg in ordered[lo:hi]:
+                        msg_id = str(raw_msg.get("message_id", ""))
+
+                        # 基础过滤：去重（分页重叠部分在转换前即被丢弃）
+                        if not msg_id or msg_id in seen_ids:
+                            continue
+
+                        # 身份过滤（排除机器人自己）
+                        sender_id = str(raw_msg.get("sender", {}).get("user_id", ""))
+                        if self.filter_bot_messages and sender_id in bot_id_set:
+                            continue
+
+                        seen_ids.add(msg_id)
+                        page_raw_messages.append(raw_msg)
+                    all_raw_messages.extend(page_raw_messages)
+
+                    # 提取锚点。
+                    # SnowLuma 仅支持 message_id 作为分页锚点。
+                    # 其他 OneBot 实现优先级: message_seq > real_id > seq > message_id
+                    # 注意：为了兼容 NapCat (NTQQ) 这种 Message ID 非连续的情况，
+                    # 以及 LLBot 这种 Sequence 模式，我们统一不进行 -1 偏移。
+                    # 分页产生的重叠消息将由上方的去重逻辑 (seen_ids 集合) 自动处理。
+                    if self._is_snowluma:
+                        new_anchor_id = chunk_earliest_msg.get("message_id")
+                    else:
+                        seq_val = (
+                            chunk_earliest_msg.get("message_seq")
+                            or chunk_earliest_msg.get("real_id")
+                            or chunk_earliest_msg.get("seq")
+                        )
+                        mid_val = chunk_earliest_msg.get("message_id")
+                        new_anchor_id = seq_val if seq_val is not None else mid_val
 
-                    # 基础过滤：去重
-                    if any(
-                        str(m.get("message_id", "")) == msg_id for m in all_raw_messages
+                    # 如果消息时间已到达起始点，或者锚点无法继续往前位移，则停止
+                    if chunk_earliest_time <= start_timestamp:
+                        logger.debug(
+                            f"OneBot 分页拉取：已到达起始时间 ({start_timestamp})，回溯同步完成。"
+                        )
+                    elif current_anchor_id and str(new_anchor_id) == str(
+                        current_anchor_id
                     ):
-                        continue
-
-                    # 身份过滤（排除机器人自己）
-                    sender_id = str(raw_msg.get("sender", {}).get("user_id", ""))
-                    if self.filter_bot_messages and sender_id in self.bot_self_ids:
-                        continue
-
-                    # 时间范围判定
-                    if start_timestamp <= msg_time <= int(datetime.now().timestamp()):
-                        all_raw_messages.append(raw_msg)
-
-                # 提取锚点。
-                # SnowLuma 仅支持 message_id 作为分页锚点。
-                # 其他 OneBot 实现优先级: message_seq > real_id > seq > message_id
-                # 注意：为了兼容 NapCat (NTQQ) 这种 Message ID 非连续的情况，
-                # 以及 LLBot 这种 Sequence 模式，我们统一不进行 -1 偏移。
-                # 分页产生的重叠消息将由上方的去重逻辑 (all_raw_messages 循环对比) 自动处理。
-                if self._is_snowluma:
-                    new_anchor_id = chunk_earliest_msg.get("message_id")
-                else:
-                    seq_val = (
-                        chunk_earliest_msg.get("message_seq")
-                        or chunk_earliest_msg.get("real_id")
-                        or chunk_earliest_msg.get("seq")
-                    )
-                    mid_val = chunk_earliest_msg.get("message_id")
-                    new_anchor_id = seq_val if seq_val is not None else mid_val
-
-                # 如果消息时间已到达起始点，或者锚点无法继续往前位移，则停止
-                if chunk_earliest_time <= start_timestamp:
-                    logger.debug(
-                        f"OneBot 分页拉取：已到达起始时间 ({start_timestamp})，回溯同步完成。"
-                    )
-                    break
-
-                if current_anchor_id and str(new_anchor_id) == str(current_anchor_id):
-                    logger.debug(
-                        "OneBot 分页拉取：消息锚点未发生有效位移，可能已到达历史尽头。"
-                    )
-                    break
-
-                current_anchor_id = new_anchor_id
-                logger.debug(
-                    f"OneBot 分页拉取进度: 已获取 {len(all_raw_messages)} 条基础/有效消息，下一次锚点: {current_anchor_id}"
-                )
-
-                # 稍微延迟，减缓服务端压力
-                await asyncio.sleep(0.05)
-
-            # 统一转换为 UnifiedMessage 并在返回前去重排序
-            unified_messages = []
-            seen_ids = set()
-            for raw_msg in all_raw_messages:
-                mid = str(raw_msg.get("message_id", ""))
-                if not mid or mid in seen_ids:
-                    continue
+                        logger.debug(
+                            "OneBot 分页拉取：消息锚点未发生有效位移，可能已到达历史尽头。"
+                        )
+                    elif history_exhausted:
+                        logger.debug(
+                            f"OneBot 分页拉取：本页仅返回 {len(messages)} 条（请求 {requested_count} 条），已到达历史尽头。"
+                        )
+                    elif len(all_raw_messages) < max_count:
+                        current_anchor_id = new_anchor_id
+                        logger.debug(
+                            f"OneBot 分页拉取进度: 已获取 {len(all_raw_messages)} 条基础/有效消息，下一次锚点: {current_anchor_id}"
+                        )
+                        # 预取下一页，稍作延迟以减缓服务端压力
+                        requested_count = min(
+                            chunk_size, max_count - len(all_raw_messages)
+                        )
+                        pending = asyncio.create_task(
+                            self._fetch_history_page(
+                                group_id,
+                                current_anchor_id,
+                                requested_count,
+                                delay=0.05,
+                            )
+                        )
 
-                unified = self._convert_message(raw_msg, group_id)
-                if unified:
-                    unified_messages.append(unified)
-                    seen_ids.add(mid)
+                    # 转换本页消息：纯 Python 计算放到工作线程，不阻塞事件循环，
+                    # 同时与下一页请求并发进行
+                    if page_raw_messages:
+                        unified_messages.extend(
+                            await asyncio.to_thread(
+                                self._convert_batch, page_raw_messages, group_id
+                            )
+                        )
+            finally:
+                if pending is not None:
+                    pending.cancel()
 
             # 确保最终结果符合时间顺序
-            unified_messages.sort(key=lambda m: m.timestamp)
+            unified_messages.sort(key=attrgetter("timestamp"))
 
             logger.info(
                 f"OneBot 分页拉取完成: 共处理 {len(all_raw_messages)} 条原始消息, 最终有效 {len(unified_messages)} 条"
@@ -299,6 +594,50 @@ class OneBotAdapter(PlatformAdapter):
             logger.warning(f"OneBot 分页获取消息失败: {e}")
             return []
 
+    async def _fetch_history_page(
+        self,
+        group_id: str,
+        anchor_id: Any,
+        count: int,
+        delay: float = 0.0,
+    ) -> Any:
+        """
+        内部方法：拉取一页群历史消息。
+
+        Args:
+            group_id (str): 群号
+            anchor_id (Any): 分页锚点（SnowLuma 为 message_id，其余为 message_seq）
+            count (int): 本页拉取条数
+            delay (float): 发起请求前的节流延迟（秒）
+        """
+        if delay:
+            await asyncio.sleep(delay)
+
+        params: dict[str, int | str | bool | None] = {
+            "group_id": _to_int(group_id),
+            "count": count,
+        }
+        if self._is_snowluma:
+            if anchor_id:
+                params["message_id"] = anchor_id
+        else:
+            params["reverseOrder"] = True
+            if anchor_id:
+                params["message_seq"] = anchor_id
+
+        return await self.bot.call_action("get_group_msg_history", **params)
+
+    def _convert_batch(
+        self, raw_messages: list[dict], group_id: str
+    ) -> list[UnifiedMessage]:
+        """内部方法：同步批量转换一组已去重的原始消息（供工作线程调用）。"""
+        unified_messages = []
+        for raw_msg in raw_messages:
+            unified = self._convert_message(raw_msg, group_id)
+            if unified:
+                unified_messages.append(unified)
+        return unified_messages
+
     def _convert_message(self, raw_msg: dict, group_id: str) -> UnifiedMessage | None:
         """内部方法：将 OneBot 原生原始消息字典转换为 UnifiedMessage 值对象。"""
         try:
@@ -310,100 +649,26 @@ class OneBotAdapter(PlatformAdapter):
                 message_chain = [{"type": "text", "data": {"text": message_chain}}]
 
             contents = []
-            text_parts = []
+            text_content = ""
+            reply_to = None
 
             for seg in message_chain:
                 seg_type = seg.get("type", "")
-                seg_data = seg.get("data", {})
-
-                if seg_type == "text":
-                    text = seg_data.get("text", "")
-                    text_parts.append(text)
-                    contents.append(
-                        MessageContent(type=MessageContentType.TEXT, text=text)
-                    )
-
-                elif seg_type == "image":
-                    # QQ 平台: subType=1 表示表情包，通过 raw_data 传递给下游统计
-                    sub_type = seg_data.get("subType", seg_data.get("sub_type"))
-                    # 安全地转换为整数，防止非数字值导致异常
-                    try:
-                        is_sticker = int(sub_type) == 1
-                    except (TypeError, ValueError):
-                        is_sticker = False
-                    # 只在 sub_type 有效时包含在 raw_data 中
-                    raw_data: dict[str, Any] = {"summary": seg_data.get("summary", "")}
-                    if sub_type is not None:
-                        raw_data["sub_type"] = int(sub_type)
-                    contents.append(
-                        MessageContent(
-                            type=MessageContentType.EMOJI
-                            if is_sticker
-                            else MessageContentType.IMAGE,
-                            url=seg_data.get("url", seg_data.get("file", "")),
-                            raw_data=raw_data,
-                        )
-                    )
-
-                elif seg_type == "at":
-                    contents.append(
-                        MessageContent(
-                            type=MessageContentType.AT,
-                            at_user_id=str(seg_data.get("qq", "")),
-                        )
-                    )
-
-                elif seg_type in ("face", "mface", "bface", "sface"):
-                    contents.append(
-                        MessageContent(
-                            type=MessageContentType.EMOJI,
-                            emoji_id=str(seg_data.get("id", "")),
-                            raw_data={"face_type": seg_type},
-                        )
-                    )
-
-                elif seg_type == "reply":
-                    contents.append(
-                        MessageContent(
-                            type=MessageContentType.REPLY,
-                            raw_data={"reply_id": seg_data.get("id", "")},
-                        )
-                    )
-
-                elif seg_type == "forward":
-                    contents.append(
-                        MessageContent(
-                            type=MessageContentType.FORWARD, raw_data=seg_data
-                        )
-                    )
-
-                elif seg_type == "record":
-                    contents.append(
-                        MessageContent(
-                            type=MessageContentType.VOICE,
-                            url=seg_data.get("url", seg_data.get("file", "")),
-                        )
-                    )
-
-                elif seg_type == "video":
-                    contents.append(
-                        MessageContent(
-                            type=MessageContentType.VIDEO,
-                            url=seg_data.get("url", seg_data.get("file", "")),
-                        )
-                    )
-
-                else:
+                builder = _SEGMENT_BUILDERS.get(seg_type)
+                if builder is None:
                     contents.append(
                         MessageContent(type=MessageContentType.UNKNOWN, raw_data=seg)
                     )
+                    continue
 
-            # 提取回复 ID
-            reply_to = None
-            for c in contents:
-                if c.type == MessageContentType.REPLY and c.raw_data:
-                    reply_to = str(c.raw_data.get("reply_id", ""))
-                    break
+                content = builder(seg.get("data", {}), seg_type)
+                contents.append(content)
+                # 文本与回复 ID 在同一遍扫描中提取；多数消息只有一个文本段，
+                # 直接拼接字符串（CPython 对局部变量原地扩展），无需中间列表
+                if content.type is MessageContentType.TEXT:
+                    text_content += content.text
+                elif reply_to is None and content.type is MessageContentType.REPLY:
+                    reply_to = str(content.raw_data.get("reply_id", ""))
 
             return UnifiedMessage(
                 message_id=str(raw_msg.get("message_id", "")),
@@ -411,7 +676,7 @@ class OneBotAdapter(PlatformAdapter):
                 sender_name=sender.get("nickname", ""),
                 sender_card=sender.get("card", "") or None,
                 group_id=group_id,
-                text_content="".join(text_parts),
+                text_content=text_content,
                 contents=tuple(contents),
                 timestamp=raw_msg.get("time", 0),
                 platform="onebot",
@@ -434,67 +699,32 @@ class OneBotAdapter(PlatformAdapter):
         Returns:
             list[dict]: OneBot 格式的消息字典列表
         """
-        raw_messages = []
-        for msg in messages:
-            message_chain = []
-            for content in msg.contents:
-                if content.type == MessageContentType.TEXT:
-                    message_chain.append(
-                        {"type": "text", "data": {"text": content.text or ""}}
-                    )
-                elif content.type == MessageContentType.IMAGE:
-                    message_chain.append(
-                        {"type": "image", "data": {"url": content.url or ""}}
-                    )
-                elif content.type == MessageContentType.AT:
-                    message_chain.append(
-                        {"type": "at", "data": {"qq": content.at_user_id or ""}}
-                    )
-                elif content.type == MessageContentType.EMOJI:
-                    face_type = (
-                        content.raw_data.get("face_type", "face")
-                        if content.raw_data
-                        else "face"
-                    )
-                    message_chain.append(
-                        {"type": face_type, "data": {"id": content.emoji_id or ""}}
-                    )
-                elif content.type == MessageContentType.REPLY:
-                    reply_id = (
-                        content.raw_data.get("reply_id", "") if content.raw_data else ""
-                    )
-                    message_chain.append({"type": "reply", "data": {"id": reply_id}})
-                elif content.type == MessageContentType.FORWARD:
-                    message_chain.append(
-                        {"type": "forward", "data": content.raw_data or {}}
-                    )
-                elif content.type == MessageContentType.VOICE:
-                    message_chain.append(
-                        {"type": "record", "data": {"url": content.url or ""}}
-                    )
-                elif content.type == MessageContentType.VIDEO:
-                    message_chain.append(
-                        {"type": "video", "data": {"url": content.url or ""}}
-                    )
-                elif content.type == MessageContentType.UNKNOWN and content.raw_data:
-                    message_chain.append(content.raw_data)
-
-            raw_msg = {
-                "message_id": msg.message_id,
-                "time": msg.timestamp,
-                "sender": {
-                    "user_id": msg.sender_id,
-                    "nickname": msg.sender_name,
-                    "card": msg.sender_card or "",
-                },
-                "message": message_chain,
-                "group_id": msg.group_id,
-                "raw_message": msg.text_content,
-                "user_id": msg.sender_id,
-            }
-            raw_messages.append(raw_msg)
+        return [self._msg_to_raw_dict(msg) for msg in messages]
+
+    @staticmethod
+    def _msg_to_raw_dict(msg: UnifiedMessage) -> dict[str, Any]:
+        """内部方法：将单条统一消息转换为 OneBot 格式字典。"""
+        message_chain = []
+        for content in msg.contents:
+            builder = _RAW_SEGMENT_BUILDERS.get(content.type)
+            if builder is not None:
+                message_chain.append(builder(content))
+            elif content.type is MessageContentType.UNKNOWN and content.raw_data:
+                message_chain.append(content.raw_data)
 
-        return raw_messages
+        return {
+            "message_id": msg.message_id,
+            "time": msg.timestamp,
+            "sender": {
+                "user_id": msg.sender_id,
+                "nickname": msg.sender_name,
+                "card": msg.sender_card or "",
+            },
+            "message": message_chain,
+            "group_id": msg.group_id,
+            "raw_message": msg.text_content,
+            "user_id": msg.sender_id,
+        }
 
     # ==================== IMessageSender 实现 ====================
 
@@ -523,7 +753,7 @@ class OneBotAdapter(PlatformAdapter):
 
             await self.bot.call_action(
                 "send_group_msg",
-                group_id=int(group_id),
+                group_id=_to_int(group_id),
                 message=message,
             )
             self._record_mute_status(group_id, False)  # 成功发送，清除禁言缓存
@@ -554,6 +784,8 @@ class OneBotAdapter(PlatformAdapter):
         try:
             use_base64 = self._get_use_base64()
             abs_path, is_remote, exists = self._prepare_path(path)
+            # 同一次发送内 Base64 结果只读取编码一次，优先与兜底阶段共用
+            b64: str | None = None
 
             # 1. 优先尝试 Base64 (如果开启)
             if use_base64 and not is_remote:
@@ -562,6 +794,9 @@ class OneBotAdapter(PlatformAdapter):
                     try:
                         await worker(b64, "Base64 优先")
                         return True
+                    except _UnsupportedActionError as e:
+                        logger.warning(f"[{label}] 协议端不支持该操作: {e}")
+                        return False
                     except Exception:
                         pass
 
@@ -577,6 +812,10 @@ class OneBotAdapter(PlatformAdapter):
                         )
                     await worker(file_val, "路径模式")
                     return True
+                except _UnsupportedActionError as e:
+                    # 接口本身不可用，无需再读取文件做 Base64 补救
+                    logger.warning(f"[{label}] 协议端不支持该操作: {e}")
+                    return False
                 except Exception as e:
                     if not use_base64:
                         logger.error(f"[{label}] 发送失败: {e}")
@@ -589,7 +828,8 @@ class OneBotAdapter(PlatformAdapter):
 
             # 3. 兜底回退
             if not is_remote:
-                b64 = await self._get_base64_from_file(abs_path)
+                if b64 is None:
+                    b64 = await self._get_base64_from_file(abs_path)
                 if b64:
                     await worker(b64, "Base64 补发")
                     return True
@@ -599,32 +839,68 @@ class OneBotAdapter(PlatformAdapter):
             logger.error(f"[{label}] 发送异常: {e}")
             return False
 
-    async def send_image(
+    async def _send_with_fallback(
         self,
         group_id: str,
-        image_path: str,
-        caption: str = "",
+        action: str,
+        path: str,
+        build_params: Callable[[str], dict[str, Any]],
+        label: str,
+        format_path_as_url: bool = False,
+        track_mute: bool = True,
     ) -> bool:
-        """向群组发送图片消息。"""
+        """
+        以统一的传输策略（路径优先 / Base64 兜底）调用单个群文件类 API。
 
-        async def do_send(file_val: str, label: str):
-            msg = []
-            if caption:
-                msg.append({"type": "text", "data": {"text": caption}})
-            msg.append({"type": "image", "data": {"file": file_val}})
+        Args:
+            group_id: 目标群号
+            action: OneBot API 名称
+            path: 文件路径或 URL
+            build_params: 根据文件值 (路径 / URL / base64://) 构造 API 参数
+            label: 业务标签，用于日志
+            format_path_as_url: 是否将本地路径格式化为 file:/// 形式
+            track_mute: 是否根据调用结果维护禁言状态缓存
+        """
+        # 非数字群号无法转换为 OneBot 所需的整数，直接判定失败而不是向上抛出
+        try:
+            _to_int(group_id)
+        except ValueError:
+            logger.error(f"[{label}] 无效的群号: {group_id}")
+            return False
+
+        async def worker(file_val: str, mode_label: str):
             try:
-                await self.bot.call_action(
-                    "send_group_msg", group_id=int(group_id), message=msg
-                )
-                self._record_mute_status(group_id, False)
+                await self.bot.call_action(action, **build_params(file_val))
+                if track_mute:
+                    self._record_mute_status(group_id, False)
             except Exception as e:
-                if self._is_mute_exception(e):
+                if track_mute and self._is_mute_exception(e):
                     self._record_mute_status(group_id, True)
                 raise
-            logger.debug(f"[OneBot] 图片发送成功 ({label}): 群 {group_id}")
+            logger.debug(f"[{label}] 发送成功 ({mode_label}): 群 {group_id}")
 
         return await self._execute_transmission_strategy(
-            image_path, do_send, "OneBot 图片", format_path_as_url=True
+            path, worker, label, format_path_as_url=format_path_as_url
+        )
+
+    async def send_image(
+        self,
+        group_id: str,
+        image_path: str,
+        caption: str = "",
+    ) -> bool:
+        """向群组发送图片消息。"""
+        prefix = [{"type": "text", "data": {"text": caption}}] if caption else []
+        return await self._send_with_fallback(
+            group_id,
+            "send_group_msg",
+            image_path,
+            lambda file_val: {
+                "group_id": _to_int(group_id),
+                "message": [*prefix, {"type": "image", "data": {"file": file_val}}],
+            },
+            "OneBot 图片",
+            format_path_as_url=True,
         )
 
     async def send_file(
@@ -634,24 +910,17 @@ class OneBotAdapter(PlatformAdapter):
         filename: str | None = None,
     ) -> bool:
         """通过群文件功能上传并发送文件。"""
-
-        async def do_upload(content: str, label: str):
-            try:
-                await self.bot.call_action(
-                    "upload_group_file",
-                    group_id=int(group_id),
-                    file=content,
-                    name=filename or os.path.basename(file_path),
-                )
-                self._record_mute_status(group_id, False)
-            except Exception as e:
-                if self._is_mute_exception(e):
-                    self._record_mute_status(group_id, True)
-                raise
-            logger.debug(f"[OneBot] 文件发送成功 ({label}): {filename or file_path}")
-
-        return await self._execute_transmission_strategy(
-            file_path, do_upload, "OneBot 文件"
+        name = filename or os.path.basename(file_path)
+        return await self._send_with_fallback(
+            group_id,
+            "upload_group_file",
+            file_path,
+            lambda file_val: {
+                "group_id": _to_int(group_id),
+                "name": name,
+                "file": file_val,
+            },
+            "OneBot 文件",
         )
 
     async def send_forward_msg(
@@ -674,7 +943,7 @@ class OneBotAdapter(PlatformAdapter):
 
             await self.bot.call_action(
                 "send_group_forward_msg",
-                group_id=int(group_id),
+                group_id=_to_int(group_id),
                 messages=nodes,
             )
             self._record_mute_status(group_id, False)
@@ -692,7 +961,7 @@ class OneBotAdapter(PlatformAdapter):
         try:
             result = await self.bot.call_action(
                 "get_group_info",
-                group_id=int(group_id),
+                group_id=_to_int(group_id),
             )
 
             if not result:
@@ -722,7 +991,7 @@ class OneBotAdapter(PlatformAdapter):
         try:
             result = await self.bot.call_action(
                 "get_group_member_list",
-                group_id=int(group_id),
+                group_id=_to_int(group_id),
             )
 
             members = []
@@ -749,8 +1018,8 @@ class OneBotAdapter(PlatformAdapter):
         try:
             result = await self.bot.call_action(
                 "get_group_member_info",
-                group_id=int(group_id),
-                user_id=int(user_id),
+                group_id=_to_int(group_id),
+                user_id=_to_int(user_id),
             )
 
             if not result:
@@ -777,20 +1046,34 @@ class OneBotAdapter(PlatformAdapter):
             str | None: base64://... 格式的字符串，读取失败返回 None
         """
         try:
-            import os
-
-            if not os.path.exists(file_path):
-                logger.error(f"文件不存在，无法读取 Base64: {file_path}")
-                return None
-
-            with open(file_path, "rb") as f:
-                data = f.read()
-                b64 = base64.b64encode(data).decode("utf-8")
-                return f"base64://{b64}"
+            # 读取与编码放到线程中执行，避免大文件阻塞事件循环
+            # 不再预先 os.path.exists 检查，直接由 open() 抛出并在此处理
+            return await asyncio.to_thread(self._encode_file_base64, file_path)
+        except FileNotFoundError:
+            logger.error(f"文件不存在，无法读取 Base64: {file_path}")
+            return None
         except Exception as e:
             logger.error(f"读取文件并转换 Base64 失败: {e}")
             return None
 
+    @staticmethod
+    def _encode_file_base64(file_path: str) -> str:
+        """
+        内部方法：分块读取文件并流式编码为 base64://... 字符串。
+
+        块大小为 3 的倍数，各块编码结果可直接拼接，无需一次性读入整个文件。
+        """
+        out = bytearray(b"base64://")
+        with open(file_path, "rb") as f:
+            while chunk := f.read(BASE64_CHUNK_SIZE):
+                out += _b64encode(chunk)
+        return out.decode("ascii")
+
+    @staticmethod
+    def _encode_bytes_b64(data: bytes) -> str:
+        """内部方法：将已读入内存的字节编码为 Base64 字符串（不含前缀）。"""
+        return _b64encode(data).decode("ascii")
+
     # ==================== IAvatarRepository 实现 ====================
 
     async def get_user_avatar_url(
@@ -808,11 +1091,17 @@ class OneBotAdapter(PlatformAdapter):
         Returns:
             str: 格式化后的 URL
         """
+        return self._build_user_avatar_url(user_id, size)
+
+    def _build_user_avatar_url(self, user_id: str, size: int) -> str:
+        """内部方法：同步拼接用户头像 URL（纯字符串运算，无网络请求）。"""
         actual_size = self._get_nearest_size(size)
         # 640 使用 HD 接口更清晰
         if actual_size >= 640:
-            return self.USER_AVATAR_HD_TEMPLATE.format(user_id=user_id, size=640)
-        return self.USER_AVATAR_TEMPLATE.format(user_id=user_id, size=actual_size)
+            return (
+                f"https://q.qlogo.cn/headimg_dl?dst_uin={user_id}&spec=640&img_type=jpg"
+            )
+        return f"https://q1.qlogo.cn/g?b=qq&nk={user_id}&s={actual_size}"
 
     async def get_user_avatar_data(
         self,
@@ -821,21 +1110,35 @@ class OneBotAdapter(PlatformAdapter):
     ) -> str | None:
         """
         通过网络下载头像并转换为 Base64 格式，适用于前端模板直接渲染。
+
+        报告周期内群成员头像极少变化，结果按 (user_id, 实际尺寸) 缓存，
+        命中且未过期时直接返回，避免重复下载与编码。
         """
+        key = (str(user_id), self._get_nearest_size(size))
+        cache = self._avatar_cache
+        cached = cache.get(key)
+        if cached is not None:
+            if time.monotonic() - cached[0] < AVATAR_DATA_CACHE_TTL:
+                cache.move_to_end(key)
+                return cached[1]
+            del cache[key]
+
         url = await self.get_user_avatar_url(user_id, size)
         if not url:
             return None
 
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    url, timeout=aiohttp.ClientTimeout(total=5)
-                ) as resp:
-                    if resp.status == 200:
-                        data = await resp.read()
-                        b64 = base64.b64encode(data).decode("utf-8")
-                        content_type = resp.headers.get("Content-Type", "image/png")
-                        return f"data:{content_type};base64,{b64}"
+            async with self._get_http_session().get(url) as resp:
+                if resp.status == 200:
+                    data = await resp.read()
+                    b64 = self._encode_bytes_b64(data)
+                    content_type = resp.headers.get("Content-Type", "image/png")
+                    data_uri = f"data:{content_type};base64,{b64}"
+                    cache[key] = (time.monotonic(), data_uri)
+                    cache.move_to_end(key)
+                    while len(cache) > AVATAR_DATA_CACHE_SIZE:
+                        cache.popitem(last=False)
+                    return data_uri
         except Exception as e:
             logger.debug(f"OneBot 头像下载失败: {e}")
         return None
@@ -847,18 +1150,40 @@ class OneBotAdapter(PlatformAdapter):
     ) -> str | None:
         """获取 QQ 群头像地址。"""
         actual_size = self._get_nearest_size(size)
-        return self.GROUP_AVATAR_TEMPLATE.format(group_id=group_id, size=actual_size)
+        return (
+            f"https://p.qlogo.cn/gh/{group_id}/{group_id}"
+            + self._GROUP_AVATAR_SUFFIXES[actual_size]
+        )
 
     async def batch_get_avatar_urls(
         self,
         user_ids: list[str],
         size: int = 100,
     ) -> dict[str, str | None]:
-        """批量映射 QQ 号到其头像 URL 地址。"""
-        return {
-            user_id: await self.get_user_avatar_url(user_id, size)
-            for user_id in user_ids
-        }
+        """批量映射 QQ 号到其头像 URL 地址（同步拼接，无需逐个 await）。"""
+        build = self._build_user_avatar_url
+        return {user_id: build(user_id, size) for user_id in user_ids}
+
+    async def batch_get_avatar_data(
+        self,
+        user_ids: list[str],
+        size: int = 100,
+    ) -> dict[str, str | None]:
+        """
+        并发下载多个用户的头像并转换为 Base64 Data URI。
+
+        通过共享 HTTP 会话有界并发下载，单个用户失败时对应值为 None。
+        """
+        if not user_ids:
+            return {}
+
+        semaphore = asyncio.Semaphore(32)
+
+        async def _fetch(uid: str) -> tuple[str, str | None]:
+            async with semaphore:
+                return uid, await self.get_user_avatar_data(uid, size)
+
+        return dict(await asyncio.gather(*(_fetch(uid) for uid in user_ids)))
 
     async def is_group_muted(self, group_id: str) -> bool:
         """
@@ -868,7 +1193,7 @@ class OneBotAdapter(PlatformAdapter):
 
         # 1. 检查最近缓存的禁言状态（5分钟内有效）
         last_mute_time = self._muted_groups_cache.get(group_id_str)
-        if last_mute_time and (time.time() - last_mute_time) < 300:
+        if last_mute_time is not None and (time.monotonic() - last_mute_time) < 300:
             logger.info(
                 f"[OneBot] 从缓存中检测到群 {group_id_str} 最近处于禁言状态，跳过分析"
             )
@@ -919,15 +1244,15 @@ class OneBotAdapter(PlatformAdapter):
                 member_info = await asyncio.wait_for(
                     self.bot.call_action(
                         "get_group_member_info",
-                        group_id=int(group_id),
-                        user_id=int(bot_user_id),
+                        group_id=_to_int(group_id),
+                        user_id=_to_int(bot_user_id),
                     ),
                     timeout=5.0,
                 )
                 if member_info:
                     role = member_info.get("role", "member")
                     # 缓存角色信息，用于 get_group_member_info 超时时降级使用
-                    self._group_role_cache[group_id_str] = (role, time.time())
+                    self._group_role_cache[group_id_str] = (role, time.monotonic())
                     shut_up_time = member_info.get("shut_up_time", 0)
                     if shut_up_time > 0:
                         # 如果 shut_up_time 是 Unix 时间戳
@@ -973,7 +1298,7 @@ class OneBotAdapter(PlatformAdapter):
                 group_info = await asyncio.wait_for(
                     self.bot.call_action(
                         "get_group_info",
-                        group_id=int(group_id),
+                        group_id=_to_int(group_id),
                     ),
                     timeout=5.0,
                 )
@@ -1007,6 +1332,40 @@ class OneBotAdapter(PlatformAdapter):
         # 如果所有检测均未发现禁言，则暂时视为未禁言
         return False
 
+    @staticmethod
+    def _is_unsupported_error(e: Exception) -> bool:
+        """
+        判断异常是否表示协议端不支持该 API（而非参数、文件等可重试问题）。
+
+        优先依据结构化的 retcode（ActionFailed.retcode 或 result["retcode"]），
+        文本特征仅在 wording/message 等错误描述字段中匹配。
+        """
+        result = getattr(e, "result", None)
+        if not isinstance(result, dict):
+            result = {}
+
+        retcode = getattr(e, "retcode", None)
+        if retcode is None:
+            retcode = result.get("retcode")
+        try:
+            if retcode is not None and int(retcode) == _UNSUPPORTED_ACTION_RETCODE:
+                return True
+        except (TypeError, ValueError):
+            pass
+
+        for value in (
+            getattr(e, "wording", None),
+            getattr(e, "message", None),
+            result.get("wording"),
+            result.get("message"),
+            result.get("msg"),
+        ):
+            if isinstance(value, str) and value:
+                lowered = value.lower()
+                if any(kw in lowered for kw in _UNSUPPORTED_ACTION_KEYWORDS):
+                    return True
+        return False
+
     def _is_mute_exception(self, e: Exception) -> bool:
         if not e:
             return False
@@ -1052,7 +1411,7 @@ class OneBotAdapter(PlatformAdapter):
         if is_muted:
             # Prune expired cache entries if cache size grows too large (threshold of 1000)
             if len(self._muted_groups_cache) >= 1000:
-                now = time.time()
+                now = time.monotonic()
                 expired_keys = [
                     k for k, t in self._muted_groups_cache.items() if now - t >= 300
                 ]
@@ -1063,11 +1422,11 @@ class OneBotAdapter(PlatformAdapter):
                 if len(self._muted_groups_cache) >= 1000:
                     oldest_key = min(
                         self._muted_groups_cache,
-                        key=lambda k: self._muted_groups_cache[k],
+                        key=self._muted_groups_cache.__getitem__,
                     )
                     self._muted_groups_cache.pop(oldest_key, None)
 
-            self._muted_groups_cache[group_id_str] = time.time()
+            self._muted_groups_cache[group_id_str] = time.monotonic()
         else:
             self._muted_groups_cache.pop(group_id_str, None)
 
@@ -1083,20 +1442,22 @@ class OneBotAdapter(PlatformAdapter):
         folder_id: str | None = None,
     ) -> bool:
         """上传文件到群文件目录的指定子文件夹。"""
-
-        async def do_upload(content: str, label: str):
-            params = {
-                "group_id": int(group_id),
-                "file": content,
-                "name": filename or os.path.basename(file_path),
-            }
-            if folder_id:
-                params["folder"] = folder_id
-            await self.bot.call_action("upload_group_file", **params)
-            logger.debug(f"[OneBot] 群文件发送成功 ({label}): {params['name']}")
-
-        return await self._execute_transmission_strategy(
-            file_path, do_upload, "OneBot 群文件"
+        base_params: dict[str, Any] = {
+            "name": filename or os.path.basename(file_path),
+        }
+        if folder_id:
+            base_params["folder"] = folder_id
+        return await self._send_with_fallback(
+            group_id,
+            "upload_group_file",
+            file_path,
+            lambda file_val: {
+                **base_params,
+                "group_id": _to_int(group_id),
+                "file": file_val,
+            },
+            "OneBot 群文件",
+            track_mute=False,
         )
 
     async def create_group_file_folder(
@@ -1114,10 +1475,12 @@ class OneBotAdapter(PlatformAdapter):
         Returns:
             str | None: 创建成功时返回 folder_id，失败返回 None
         """
+        # 无论创建成功与否，均使文件夹列表缓存失效，确保随后的查找能看到新文件夹
+        self._folder_cache.pop(str(group_id), None)
         try:
             result = await self.bot.call_action(
                 "create_group_file_folder",
-                group_id=int(group_id),
+                group_id=_to_int(group_id),
                 name=folder_name,
                 parent_id="/",
             )
@@ -1153,10 +1516,19 @@ class OneBotAdapter(PlatformAdapter):
             list[dict]: 文件夹列表，每项包含 folder_id/name 等字段。
                         API 不可用时返回空列表。
         """
+        return await self._get_cached_group_list(
+            self._folder_cache,
+            "folder",
+            group_id,
+            self._fetch_group_file_root_folders,
+        )
+
+    async def _fetch_group_file_root_folders(self, group_id: str) -> list[dict]:
+        """内部方法：实际请求群文件根目录文件夹列表（不经缓存）。"""
         try:
             result = await self.bot.call_action(
                 "get_group_root_files",
-                group_id=int(group_id),
+                group_id=_to_int(group_id),
             )
             if isinstance(result, dict):
                 return result.get("folders", []) or []
@@ -1221,6 +1593,10 @@ class OneBotAdapter(PlatformAdapter):
         strict_mode: bool = False,
     ) -> bool:
         """上传图片到群相册（NapCat 扩展 API）。"""
+        if time.monotonic() < self._album_unsupported_until:
+            logger.debug(f"[群分析相册] 协议端不支持相册上传，跳过 (群 {group_id})")
+            return False
+
         # 严格模式：指定了相册名但未解析到 album_id 时，禁止上传
         if strict_mode and album_name and not album_id:
             logger.info(
@@ -1251,7 +1627,7 @@ class OneBotAdapter(PlatformAdapter):
                 # LLBot 模式：使用 files 参数 (列表)
                 # LLBot 的 upload_group_album 接收 files 作为数组
                 llbot_params = {
-                    "group_id": int(group_id),
+                    "group_id": _to_int(group_id),
                     "album_id": str(album_id),
                     "files": [content],
                 }
@@ -1267,26 +1643,41 @@ class OneBotAdapter(PlatformAdapter):
                     )
 
             params = {
-                "group_id": int(group_id),
+                "group_id": _to_int(group_id),
                 "file": content,
                 "album_id": str(album_id),
             }
             if album_name:
                 params["album_name"] = album_name
 
-            for action in [
+            # 上传非幂等，不能并发探测；优先使用上次成功的 API
+            actions = [
                 "upload_image_to_qun_album",
                 "upload_group_album",
                 "upload_qun_album",
-            ]:
+            ]
+            preferred = self._preferred_album_upload_api
+            if preferred:
+                actions.remove(preferred)
+                actions.insert(0, preferred)
+
+            all_unsupported = True
+            for action in actions:
                 try:
                     await self.bot.call_action(action, **params)
                     logger.debug(
                         f"[群分析相册] 上传成功 ({label}, {action}): 群 {group_id}"
                     )
+                    self._preferred_album_upload_api = action
                     return
-                except Exception:
+                except Exception as e:
+                    if not self._is_unsupported_error(e):
+                        all_unsupported = False
                     continue
+            if all_unsupported:
+                # 所有候选接口均不存在：记住结论，有效期内的后续上传直接跳过
+                self._album_unsupported_until = time.monotonic() + ALBUM_UNSUPPORTED_TTL
+                raise _UnsupportedActionError("所有相册上传 API 均不受协议端支持")
             raise RuntimeError("所有相册上传 API 均调用失败")
 
         return await self._execute_transmission_strategy(
@@ -1299,63 +1690,103 @@ class OneBotAdapter(PlatformAdapter):
     ) -> list[dict]:
         """
         获取群分析相册列表（兼容多种 OneBot 扩展实现）。
-        """
 
-        def extract_list(payload: Any) -> list[dict]:
-            """从不同结构的响应中提取相册列表：直接列表、嵌套在 data 中、或直接在根字段中。"""
-            if isinstance(payload, list):
-                return [item for item in payload if isinstance(item, dict)]
-            if not isinstance(payload, dict):
-                logger.debug(
-                    f"[群分析相册] 提取相册列表失败: payload 非字典/列表类型 ({type(payload)})"
-                )
-                return []
-
-            data = payload.get("data")
-            if isinstance(data, dict):
-                album_list = data.get("album_list") or data.get("list")
-                if isinstance(album_list, list):
-                    return [item for item in album_list if isinstance(item, dict)]
-                else:
-                    logger.debug(f"[群分析相册] 在 data 字段中未找到列表: data={data}")
-
-            album_list = payload.get("album_list") or payload.get("list")
-            if isinstance(album_list, list):
-                return [item for item in album_list if isinstance(item, dict)]
-
-            logger.debug(f"[群分析相册] 无法从响应中提取相册列表: payload={payload}")
-            return []
+        结果按群短期缓存，同一轮分析内多次上传只需一次查询。
+        """
+        return await self._get_cached_group_list(
+            self._album_cache, "album", group_id, self._fetch_group_album_list
+        )
 
-        # 候选 API 名称
-        actions = [
-            "get_qun_album_list",
-            "get_group_album_list",
-            "get_group_albums",
-            "get_group_root_album_list",
-        ]
+    async def _fetch_group_album_list(self, group_id: str) -> list[dict]:
+        """内部方法：探测各扩展 API 获取群相册列表（不经缓存）。"""
 
-        for action in actions:
+        async def probe(action: str) -> tuple[str, list[dict] | None]:
+            """调用单个候选 API；调用失败时返回 None，成功则返回提取出的列表。"""
             try:
                 logger.debug(
                     f"[群分析相册] 正在通过 {action} 获取列表 (群: {group_id})..."
                 )
                 result = await self.bot.call_action(
                     action,
-                    group_id=int(group_id),
+                    group_id=_to_int(group_id),
                 )
                 logger.debug(f"[群分析相册] 接口 {action} 原始响应内容: {result}")
-                if result:
-                    albums = extract_list(result)
-                    if albums:
-                        logger.debug(
-                            f"[群分析相册] {action} 成功获取并提取到 {len(albums)} 个相册对象"
-                        )
-                        return albums
+                return action, _extract_album_list(result) if result else []
             except Exception as e:
                 logger.debug(f"[群分析相册] 接口 {action} 尝试失败: {e}")
+                return action, None
+
+        # 已知可用的 API：直接调用，调用成功即以其结果为准
+        preferred = self._preferred_album_api
+        if preferred:
+            _, albums = await probe(preferred)
+            if albums is not None:
+                return albums
+
+        # 候选 API 均为幂等读取，并发探测并采用首个非空结果，其余请求取消
+        actions = [
+            "get_qun_album_list",
+            "get_group_album_list",
+            "get_group_albums",
+            "get_group_root_album_list",
+        ]
+        tasks = [asyncio.create_task(probe(action)) for action in actions]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                action, albums = await next_done
+                if albums:
+                    logger.debug(
+                        f"[群分析相册] {action} 成功获取并提取到 {len(albums)} 个相册对象"
+                    )
+                    self._preferred_album_api = action
+                    return albums
+        finally:
+            for task in tasks:
+                task.cancel()
 
         return []
 
+    async def _get_cached_group_list(
+        self,
+        cache: dict[str, tuple[float, list[dict]]],
+        kind: str,
+        group_id: str,
+        loader: Callable[[str], Awaitable[list[dict]]],
+    ) -> list[dict]:
+        """
+        内部方法：带 TTL 与单飞（single-flight）合并的群元数据列表读取。
+
+        空结果不缓存，避免临时失败在有效期内持续生效。
+        """
+        key = str(group_id)
+        cached = cache.get(key)
+        if (
+            cached is not None
+            and time.monotonic() - cached[0] < GROUP_METADATA_CACHE_TTL
+        ):
+            return cached[1]
+
+        async with self._metadata_locks[(kind, key)]:
+            # 等锁期间可能已由其他协程填充
+            cached = cache.get(key)
+            if (
+                cached is not None
+                and time.monotonic() - cached[0] < GROUP_METADATA_CACHE_TTL
+            ):
+                return cached[1]
+
+            items = await loader(group_id)
+            if items:
+                cache[key] = (time.monotonic(), items)
+            return items
+
+    def invalidate_album_cache(self, group_id: str | None = None) -> None:
+        """使群相册列表缓存失效（不指定群号时清空全部）。"""
+        if group_id is None:
+            self._album_cache.clear()
+        else:
+            self._album_cache.pop(str(group_id), None)
+
     async def find_album_id(
         self,
         group_id: str,
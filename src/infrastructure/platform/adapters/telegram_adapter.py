@@ -7,6 +7,8 @@ Telegram 平台适配器
 
 import asyncio
 import base64
+import errno
+import functools
 import os
 import time
 from dataclasses import replace
@@ -14,6 +16,8 @@ from datetime import datetime, timedelta, timezone
 from io import BytesIO
 from typing import TYPE_CHECKING, Any
 
+import aiohttp
+
 from ....domain.value_objects.platform_capabilities import (
     TELEGRAM_CAPABILITIES,
     PlatformCapabilities,
@@ -42,6 +46,34 @@ except ImportError:
 
 TELEGRAM_AVATAR_NEGATIVE_CACHE_TTL = 600
 TELEGRAM_AVATAR_NEGATIVE_CACHE_MAX_SIZE = 1024
+# 头像下载链接有效期至少 1 小时，缓存时间需短于此
+TELEGRAM_AVATAR_URL_CACHE_TTL = 1800
+TELEGRAM_AVATAR_URL_CACHE_MAX_SIZE = 2048
+TELEGRAM_AVATAR_DEFAULT_CONCURRENCY = 8
+# 远程图片流式下载的分块大小
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+# 下载缓冲区池的最大容量
+BUFFER_POOL_SIZE = 4
+
+
+def _raw_text(content: MessageContent) -> dict:
+    return {"type": "text", "data": {"text": content.text or ""}}
+
+
+def _raw_image(content: MessageContent) -> dict:
+    return {"type": "image", "data": {"url": content.url or ""}}
+
+
+def _raw_at(content: MessageContent) -> dict:
+    return {"type": "at", "data": {"qq": content.at_user_id or ""}}
+
+
+# 统一内容类型 -> OneBot 消息段构建函数（其余类型不输出）
+_RAW_SEGMENT_BUILDERS = {
+    MessageContentType.TEXT: _raw_text,
+    MessageContentType.IMAGE: _raw_image,
+    MessageContentType.AT: _raw_at,
+}
 
 
 class TelegramAdapter(PlatformAdapter):
@@ -59,6 +91,9 @@ class TelegramAdapter(PlatformAdapter):
     - fetch_messages 从数据库读取历史消息
     """
 
+    # 所有实例共享的 HTTP 会话，远程图片下载复用已建立的连接
+    _http_session: aiohttp.ClientSession | None = None
+
     def __init__(self, bot_instance: Any, config: dict | None = None):
         super().__init__(bot_instance, config)
         self._cached_client: Any = None
@@ -68,7 +103,7 @@ class TelegramAdapter(PlatformAdapter):
         self.bot_user_id = str(config.get("bot_user_id", "")) if config else ""
 
         # 尝试从配置获取 bot self ids 列表
-        self.bot_self_ids: list[str] = []
+        self.bot_self_ids = []
         if config:
             ids = config.get("bot_self_ids", [])
             self.bot_self_ids = [str(i) for i in ids] if ids else []
@@ -76,8 +111,57 @@ class TelegramAdapter(PlatformAdapter):
         else:
             self._plugin_instance = None
         self._platform_id = str(config.get("platform_id", "")).strip() if config else ""
+        # _get_platform_id 的解析结果缓存（不缓存 "telegram" 兜底值，以便 bot 就绪后重试）
+        self._resolved_platform_id: str | None = None
         # user_id -> (expires_at, reason)
         self._avatar_negative_cache: dict[str, tuple[float, str]] = {}
+        # 远程图片下载复用的 BytesIO 缓冲区池
+        self._buf_pool: list[BytesIO] = []
+        # user_id -> (expires_at, url)
+        self._avatar_url_cache: dict[str, tuple[float, str]] = {}
+        self._avatar_concurrency = max(
+            1,
+            int(
+                config.get("avatar_concurrency", TELEGRAM_AVATAR_DEFAULT_CONCURRENCY)
+                if config
+                else TELEGRAM_AVATAR_DEFAULT_CONCURRENCY
+            ),
+        )
+
+    @classmethod
+    def _get_http_session(cls) -> aiohttp.ClientSession:
+        """内部方法：懒加载共享的 HTTP 会话（带连接池与 DNS 缓存）。"""
+        session = cls._http_session
+        if session is None or session.closed:
+            session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=32, ttl_dns_cache=300),
+                timeout=aiohttp.ClientTimeout(total=30),
+            )
+            cls._http_session = session
+        return session
+
+    @classmethod
+    async def close_http_session(cls) -> None:
+        """关闭共享的 HTTP 会话，应在插件卸载时调用。"""
+        session, cls._http_session = cls._http_session, None
+        if session is not None and not session.closed:
+            await session.close()
+
+    @property
+    def bot_self_ids(self) -> list[str]:
+        """机器人自身 ID 列表（保持配置顺序）。"""
+        return self._bot_self_ids
+
+    @bot_self_ids.setter
+    def bot_self_ids(self, value: list[str] | None) -> None:
+        # 同步维护包含 bot_user_id 的 frozenset，逐条消息过滤时只需一次成员判断
+        self._bot_self_ids = list(value or [])
+        ids = set(self._bot_self_ids)
+        # 基类初始化时 bot_user_id 尚未赋值
+        bot_user_id = getattr(self, "bot_user_id", "")
+        if bot_user_id:
+            ids.add(bot_user_id)
+        self._bot_ids_set = frozenset(ids)
 
     def set_context(self, context: "Context") -> None:
         """
@@ -131,7 +215,9 @@ class TelegramAdapter(PlatformAdapter):
         """
         懒加载获取 Telegram 客户端
 
-        支持多种获取路径，适应 AstrBot 不同版本。
+        支持多种获取路径，适应 AstrBot 不同版本。解析过程不含 await，
+        不会在协程间交错；未解析到时不缓存，以便 bot 就绪后重新探测
+        （因此不使用会永久缓存 None 的 cached_property）。
         """
         if self._cached_client is not None:
             return self._cached_client
@@ -140,30 +226,35 @@ class TelegramAdapter(PlatformAdapter):
             logger.warning("python-telegram-bot 库未安装，Telegram 适配器不可用")
             return None
 
-        # 路径 A: bot 本身就是 ExtBot
-        if ExtBot is not None and isinstance(self.bot, ExtBot):
-            self._cached_client = self.bot
-            return self._cached_client
+        bot = self.bot
+        client: Any = None
 
-        # 路径 B: bot.client
-        if hasattr(self.bot, "client"):
-            client = self.bot.client
-            if ExtBot is not None and isinstance(client, ExtBot):
-                self._cached_client = client
-                return self._cached_client
+        # 路径 A/B: bot 本身或 bot.client 是 ExtBot
+        if ExtBot is not None:
+            for candidate in (bot, getattr(bot, "client", None)):
+                if isinstance(candidate, ExtBot):
+                    client = candidate
+                    break
 
         # 路径 C: bot 有 send_message 方法（ExtBot 的特征）
-        if hasattr(self.bot, "send_message") and hasattr(self.bot, "send_photo"):
-            self._cached_client = self.bot
-            return self._cached_client
+        if (
+            client is None
+            and hasattr(bot, "send_message")
+            and hasattr(bot, "send_photo")
+        ):
+            client = bot
 
         # 尝试从 bot 的其他属性获取
-        for attr in ("_client", "telegram_client", "_telegram_client", "bot"):
-            if hasattr(self.bot, attr):
-                client = getattr(self.bot, attr)
-                if hasattr(client, "send_message"):
-                    self._cached_client = client
-                    return self._cached_client
+        if client is None:
+            for attr in ("_client", "telegram_client", "_telegram_client", "bot"):
+                candidate = getattr(bot, attr, None)
+                if candidate is not None and hasattr(candidate, "send_message"):
+                    client = candidate
+                    break
+
+        if client is not None:
+            self._cached_client = client
+            return client
 
         logger.warning("无法从 bot_instance 获取 Telegram 客户端")
         return None
@@ -213,6 +304,8 @@ class TelegramAdapter(PlatformAdapter):
             messages: list[UnifiedMessage] = []
             sender_name_cache: dict[str, str] = {}
             total_records_loaded = 0
+            # 机器人自身 ID 集合（含 bot_user_id），在转换前即排除其消息
+            excluded_sender_ids = self._bot_ids_set
 
             while len(messages) < target_count:
                 history_records = await history_mgr.get(
@@ -260,14 +353,15 @@ class TelegramAdapter(PlatformAdapter):
                     if record_time < cutoff_time:
                         continue
 
-                    msg = self._convert_history_record(record, group_id)
-                    if not msg:
+                    # 过滤机器人自己的消息（与转换结果的 sender_id 取值一致）
+                    if (
+                        str(getattr(record, "sender_id", "") or "")
+                        in excluded_sender_ids
+                    ):
                         continue
 
-                    # 过滤机器人自己的消息
-                    if self.bot_user_id and msg.sender_id == self.bot_user_id:
-                        continue
-                    if msg.sender_id in self.bot_self_ids:
+                    msg = self._convert_history_record(record, group_id)
+                    if not msg:
                         continue
 
                     msg = await self._fix_sender_name_if_needed(
@@ -304,10 +398,13 @@ class TelegramAdapter(PlatformAdapter):
         """获取平台 ID"""
         if self._platform_id:
             return self._platform_id
+        if self._resolved_platform_id is not None:
+            return self._resolved_platform_id
 
         if isinstance(self.config, dict):
             config_platform_id = str(self.config.get("platform_id", "")).strip()
             if config_platform_id:
+                self._resolved_platform_id = config_platform_id
                 return config_platform_id
 
         # 尝试从 bot 实例获取
@@ -315,7 +412,8 @@ class TelegramAdapter(PlatformAdapter):
             try:
                 meta = self.bot.meta()  # type: ignore
                 if hasattr(meta, "id"):
-                    return str(getattr(meta, "id", "telegram"))
+                    self._resolved_platform_id = str(getattr(meta, "id", "telegram"))
+                    return self._resolved_platform_id
             except Exception:
                 pass
         return "telegram"
@@ -379,77 +477,76 @@ class TelegramAdapter(PlatformAdapter):
     ) -> UnifiedMessage | None:
         """
         将数据库记录转换为 UnifiedMessage
+
+        记录字段在入口处一次性读取，循环内只访问局部变量；仅捕获记录结构不符时
+        的预期异常，其他错误照常抛出，避免被静默吞掉。
         """
         try:
-            content = record.content
+            content = getattr(record, "content", None)
             if not content:
                 return None
 
-            # 提取消息内容
-            message_parts = content.get("message", [])
-            text_content = ""
-            contents = []
-
-            for part in message_parts:
-                if isinstance(part, dict):
-                    part_type = part.get("type", "")
-                    if part_type == "plain" or part_type == "text":
-                        text = part.get("text", "")
-                        text_content += text
-                        contents.append(
-                            MessageContent(
-                                type=MessageContentType.TEXT,
-                                text=text,
-                            )
-                        )
-                    elif part_type == "image":
-                        contents.append(
-                            MessageContent(
-                                type=MessageContentType.IMAGE,
-                                url=part.get("url", "")
-                                or part.get("attachment_id", ""),
-                            )
-                        )
-                    elif part_type == "at":
-                        target_id = (
-                            part.get("target_id", "")
-                            or part.get("qq", "")
-                            or part.get("at_user_id", "")
-                        )
-                        contents.append(
-                            MessageContent(
-                                type=MessageContentType.AT,
-                                at_user_id=str(target_id),
-                            )
-                        )
+            message_parts = content.get("message") or []
+            if not isinstance(message_parts, list):
+                message_parts = []
+            message_id = str(record.id)
+            sender_id = str(record.sender_id or "")
+            sender_name = str(record.sender_name or "").strip() or "Unknown"
+            timestamp = int(record.created_at.timestamp())
+        except (AttributeError, KeyError, TypeError, ValueError) as e:
+            logger.debug(f"[Telegram] 转换历史记录失败: {e}")
+            return None
 
-            if not contents:
-                contents.append(
+        # 提取消息内容（文本片段收集后一次性拼接，避免重复 += 的平方复杂度）
+        text_type = MessageContentType.TEXT
+        text_parts: list[str] = []
+        contents = []
+        append = contents.append
+
+        for part in message_parts:
+            if not isinstance(part, dict):
+                continue
+            part_type = part.get("type", "")
+            if part_type == "plain" or part_type == "text":
+                text = part.get("text", "")
+                text_parts.append(text)
+                append(MessageContent(type=text_type, text=text))
+            elif part_type == "image":
+                append(
                     MessageContent(
-                        type=MessageContentType.TEXT,
-                        text=text_content,
+                        type=MessageContentType.IMAGE,
+                        url=part.get("url", "") or part.get("attachment_id", ""),
+                    )
+                )
+            elif part_type == "at":
+                target_id = (
+                    part.get("target_id", "")
+                    or part.get("qq", "")
+                    or part.get("at_user_id", "")
+                )
+                append(
+                    MessageContent(
+                        type=MessageContentType.AT,
+                        at_user_id=str(target_id),
                     )
                 )
 
-            sender_id = str(record.sender_id or "")
-            sender_name = str(record.sender_name or "").strip() or "Unknown"
-
-            return UnifiedMessage(
-                message_id=str(record.id),
-                sender_id=sender_id,
-                sender_name=sender_name,
-                sender_card=None,
-                group_id=group_id,
-                text_content=text_content,
-                contents=tuple(contents),
-                timestamp=int(record.created_at.timestamp()),
-                platform="telegram",
-                reply_to_id=None,
-            )
-
-        except Exception as e:
-            logger.debug(f"[Telegram] 转换历史记录失败: {e}")
-            return None
+        text_content = "".join(text_parts)
+        if not contents:
+            append(MessageContent(type=text_type, text=text_content))
+
+        return UnifiedMessage(
+            message_id=message_id,
+            sender_id=sender_id,
+            sender_name=sender_name,
+            sender_card=None,
+            group_id=group_id,
+            text_content=text_content,
+            contents=tuple(contents),
+            timestamp=timestamp,
+            platform="telegram",
+            reply_to_id=None,
+        )
 
     def convert_to_raw_format(self, messages: list[UnifiedMessage]) -> list[dict]:
         """
@@ -457,9 +554,9 @@ class TelegramAdapter(PlatformAdapter):
 
         用于向后兼容现有分析逻辑。
         """
-        result = []
-        for msg in messages:
-            raw = {
+        builders = _RAW_SEGMENT_BUILDERS
+        return [
+            {
                 "message_id": msg.message_id,
                 "group_id": msg.group_id,
                 "time": msg.timestamp,
@@ -468,28 +565,16 @@ class TelegramAdapter(PlatformAdapter):
                     "nickname": msg.sender_name,
                     "card": msg.sender_card or "",
                 },
-                "message": [],
+                # 转换消息内容
+                "message": [
+                    builders[content.type](content)
+                    for content in msg.contents
+                    if content.type in builders
+                ],
                 "user_id": msg.sender_id,
             }
-
-            # 转换消息内容
-            for content in msg.contents:
-                if content.type == MessageContentType.TEXT:
-                    raw["message"].append(
-                        {"type": "text", "data": {"text": content.text or ""}}
-                    )
-                elif content.type == MessageContentType.IMAGE:
-                    raw["message"].append(
-                        {"type": "image", "data": {"url": content.url or ""}}
-                    )
-                elif content.type == MessageContentType.AT:
-                    raw["message"].append(
-                        {"type": "at", "data": {"qq": content.at_user_id or ""}}
-                    )
-
-            result.append(raw)
-
-        return result
+            for msg in messages
+        ]
 
     # ==================== IMessageSender ====================
 
@@ -533,10 +618,10 @@ class TelegramAdapter(PlatformAdapter):
             logger.error("[Telegram] 客户端未初始化，无法发送图片")
             return False
 
+        pooled_buf: BytesIO | None = None
         try:
             chat_id, message_thread_id = self._parse_group_id(group_id)
             file_obj: Any = None
-            is_temp_obj = False
 
             kwargs: dict[str, Any] = {"chat_id": chat_id}
             if message_thread_id:
@@ -544,49 +629,31 @@ class TelegramAdapter(PlatformAdapter):
             if caption:
                 kwargs["caption"] = caption
 
-            # 1. 统一处理输入源 (Base64 / URL / Local File)
+            # 1. 统一处理输入源 (Base64 / URL / Local File)，统一转为内存中的 BytesIO
             if image_path.startswith("base64://"):
                 data = base64.b64decode(image_path[len("base64://") :])
                 file_obj = BytesIO(data)
-                is_temp_obj = True
             elif image_path.startswith("data:"):
                 parts = image_path.split(",", 1)
                 if len(parts) == 2:
                     data = base64.b64decode(parts[1])
                     file_obj = BytesIO(data)
-                    is_temp_obj = True
             elif image_path.startswith(("http://", "https://")):
                 try:
-                    import aiohttp
-
-                    async with aiohttp.ClientSession() as session:
-                        async with session.get(
-                            image_path, timeout=aiohttp.ClientTimeout(total=30)
-                        ) as resp:
-                            if resp.status == 200:
-                                data = await resp.read()
-                                file_obj = BytesIO(data)
-                                is_temp_obj = True
-                            else:
-                                file_obj = image_path  # 尝试直接发 URL
+                    # 下载失败或超过大小限制时，尝试直接发 URL
+                    pooled_buf = await self._download_image(image_path)
+                    file_obj = pooled_buf or image_path
                 except Exception as e:
                     logger.warning(f"[Telegram] 下载图片失败，尝试直接发送: {e}")
                     file_obj = image_path
             else:
-                # 本地文件
-                if os.path.exists(image_path):
-                    file_obj = open(image_path, "rb")
-                    is_temp_obj = True
-                else:
-                    file_obj = image_path
+                # 本地文件：在工作线程中读取，避免大文件阻塞事件循环
+                data = await self._read_local_file(image_path)
+                file_obj = BytesIO(data) if data is not None else image_path
 
             # 2. 发送图片
             kwargs["photo"] = file_obj
-            try:
-                await client.send_photo(**kwargs)
-            finally:
-                if is_temp_obj and hasattr(file_obj, "close"):
-                    file_obj.close()
+            await client.send_photo(**kwargs)
 
             return True
 
@@ -598,6 +665,9 @@ class TelegramAdapter(PlatformAdapter):
                 or "Photo invalid dimensions" in err_msg
             ):
                 logger.warning("[Telegram] 图片尺寸超限，正在尝试以文件形式发送...")
+                if pooled_buf is not None:
+                    self._release_buf(pooled_buf)
+                    pooled_buf = None
                 # 构造一个更有意义的文件名
                 ts = datetime.now().strftime("%Y%m%d_%H%M%S")
                 fn = f"analysis_report_{group_id}_{ts}.png"
@@ -605,6 +675,9 @@ class TelegramAdapter(PlatformAdapter):
 
             logger.error(f"[Telegram] 发送图片失败: {e}")
             return False
+        finally:
+            if pooled_buf is not None:
+                self._release_buf(pooled_buf)
 
     async def send_file(
         self,
@@ -621,7 +694,6 @@ class TelegramAdapter(PlatformAdapter):
         try:
             chat_id, message_thread_id = self._parse_group_id(group_id)
             file_obj: Any = None
-            is_temp_obj = False
 
             kwargs: dict[str, Any] = {"chat_id": chat_id}
             if message_thread_id:
@@ -631,7 +703,6 @@ class TelegramAdapter(PlatformAdapter):
             if file_path.startswith("base64://"):
                 data = base64.b64decode(file_path[len("base64://") :])
                 file_obj = BytesIO(data)
-                is_temp_obj = True
                 if not filename:
                     filename = "file.png"
             elif file_path.startswith("data:"):
@@ -639,12 +710,10 @@ class TelegramAdapter(PlatformAdapter):
                 if len(parts) == 2:
                     data = base64.b64decode(parts[1])
                     file_obj = BytesIO(data)
-                    is_temp_obj = True
                     if not filename:
                         filename = "file.png"
-            elif os.path.isfile(file_path):
-                file_obj = open(file_path, "rb")
-                is_temp_obj = True
+            elif (data := await self._read_local_file(file_path)) is not None:
+                file_obj = BytesIO(data)
                 if not filename:
                     filename = os.path.basename(file_path)
             else:
@@ -656,17 +725,75 @@ class TelegramAdapter(PlatformAdapter):
             kwargs["document"] = file_obj
             kwargs["filename"] = filename
 
-            try:
-                await client.send_document(**kwargs)
-            finally:
-                if is_temp_obj and hasattr(file_obj, "close"):
-                    file_obj.close()
+            await client.send_document(**kwargs)
 
             return True
         except Exception as e:
             logger.error(f"[Telegram] 发送文件失败: {e}")
             return False
 
+    async def _download_image(self, url: str) -> BytesIO | None:
+        """
+        内部方法：将远程图片流式下载到内存缓冲区。
+
+        分块写入单个 BytesIO，避免整包读取再复制带来的双倍内存占用；
+        响应声明或实际读取的大小超过平台图片上限时提前放弃，返回 None。
+        """
+        limit = int(self.capabilities.max_image_size_mb * 1024 * 1024)
+        async with self._get_http_session().get(url) as resp:
+            if resp.status != 200:
+                return None
+            if resp.content_length is not None and resp.content_length > limit:
+                logger.warning(
+                    f"[Telegram] 远程图片过大 ({resp.content_length} 字节)，跳过下载"
+                )
+                return None
+
+            buf = self._acquire_buf()
+            try:
+                async for chunk in resp.content.iter_chunked(DOWNLOAD_CHUNK_SIZE):
+                    if buf.tell() + len(chunk) > limit:
+                        logger.warning("[Telegram] 远程图片超过大小限制，跳过下载")
+                        self._release_buf(buf)
+                        return None
+                    buf.write(chunk)
+            except BaseException:
+                self._release_buf(buf)
+                raise
+        buf.seek(0)
+        return buf
+
+    def _acquire_buf(self) -> BytesIO:
+        """内部方法：从缓冲区池取出一个空 BytesIO（池为空时新建）。"""
+        if self._buf_pool:
+            return self._buf_pool.pop()
+        return BytesIO()
+
+    def _release_buf(self, buf: BytesIO) -> None:
+        """内部方法：清空缓冲区并归还到池中（超出容量时直接丢弃）。"""
+        buf.seek(0)
+        buf.truncate(0)
+        if len(self._buf_pool) < BUFFER_POOL_SIZE:
+            self._buf_pool.append(buf)
+
+    @staticmethod
+    async def _read_local_file(path: str) -> bytes | None:
+        """在工作线程中读取本地文件内容；路径不是可读的普通文件时返回 None。"""
+
+        def _read() -> bytes | None:
+            try:
+                with open(path, "rb") as f:
+                    return f.read()
+            except (FileNotFoundError, IsADirectoryError, NotADirectoryError):
+                return None
+            except OSError as e:
+                # 文件名过长等情况说明它并非本地路径（如 file_id）
+                if e.errno == errno.ENAMETOOLONG:
+                    return None
+                raise
+
+        return await asyncio.to_thread(_read)
+
     async def send_forward_msg(self, group_id: str, nodes: list[dict]) -> bool:
         """
         发送合并转发消息
@@ -692,14 +819,17 @@ class TelegramAdapter(PlatformAdapter):
 
         full_text = "\n".join(lines)
 
-        # 分段发送（Telegram 限制 4096 字符）
+        # 分段发送（Telegram 限制 4096 字符，预留分段序号的空间）
+        # 分段在任意字符处切开，必须按序到达才能阅读，因此保持串行发送，
+        # 并标注 "i/N" 序号便于读者确认顺序与完整性
         max_len = 4000
         if len(full_text) > max_len:
             parts = [
                 full_text[i : i + max_len] for i in range(0, len(full_text), max_len)
             ]
-            for part in parts:
-                if not await self.send_text(group_id, part):
+            total = len(parts)
+            for index, part in enumerate(parts, 1):
+                if not await self.send_text(group_id, f"({index}/{total})\n{part}"):
                     return False
             return True
         else:
@@ -715,12 +845,22 @@ class TelegramAdapter(PlatformAdapter):
 
         try:
             chat_id, _ = self._parse_group_id(group_id)
-            chat = await client.get_chat(chat_id=chat_id)
+            # 两个请求互不依赖，并发发出；成员数获取失败时按 0 处理
+            chat, member_count = await asyncio.gather(
+                client.get_chat(chat_id=chat_id),
+                client.get_chat_member_count(chat_id),
+                return_exceptions=True,
+            )
+            if isinstance(chat, BaseException):
+                raise chat
+            if isinstance(member_count, BaseException):
+                logger.debug(f"[Telegram] 获取群成员数失败: {member_count}")
+                member_count = 0
 
             return UnifiedGroup(
                 group_id=str(chat.id),
                 group_name=chat.title or "Unknown",
-                member_count=await client.get_chat_member_count(chat_id) or 0,
+                member_count=member_count or 0,
                 description=chat.description,
                 platform="telegram",
             )
@@ -797,6 +937,30 @@ class TelegramAdapter(PlatformAdapter):
             logger.debug(f"[Telegram] 获取成员信息失败: {e}")
             return None
 
+    async def get_members_info(
+        self,
+        group_id: str,
+        user_ids: list[str],
+        concurrency: int = 8,
+    ) -> dict[str, UnifiedMember | None]:
+        """
+        批量获取成员信息
+
+        以有限并发逐个调用 get_member_info，避免 N 次串行往返；
+        单个成员获取失败时对应值为 None。
+        """
+        if not user_ids:
+            return {}
+
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def _fetch_member(uid: str) -> tuple[str, UnifiedMember | None]:
+            async with semaphore:
+                return uid, await self.get_member_info(group_id, uid)
+
+        pairs = await asyncio.gather(*(_fetch_member(uid) for uid in user_ids))
+        return dict(pairs)
+
     # ==================== IAvatarRepository ====================
 
     async def get_user_avatar_url(
@@ -807,8 +971,27 @@ class TelegramAdapter(PlatformAdapter):
         """
         获取用户头像 URL
 
-        Telegram 需要调用 API 获取头像文件。
+        Telegram 需要调用 API 获取头像文件。成功结果会短期缓存，
+        同一份报告中重复请求同一用户时不再访问 API。
         """
+        user_id_str = str(user_id).strip()
+        cached = self._avatar_url_cache.get(user_id_str)
+        if cached and time.monotonic() < cached[0]:
+            return cached[1]
+
+        url = await self._fetch_user_avatar_url(user_id, size)
+        if url:
+            self._avatar_url_cache[user_id_str] = (
+                time.monotonic() + TELEGRAM_AVATAR_URL_CACHE_TTL,
+                url,
+            )
+            self._prune_expiring_cache(
+                self._avatar_url_cache, TELEGRAM_AVATAR_URL_CACHE_MAX_SIZE
+            )
+        return url
+
+    async def _fetch_user_avatar_url(self, user_id: str, size: int) -> str | None:
+        """内部方法：通过 Bot API 查询用户头像下载地址（不经正向缓存）。"""
         client = self._telegram_client
         if not client:
             logger.warning(
@@ -943,25 +1126,31 @@ class TelegramAdapter(PlatformAdapter):
 
     def _prune_avatar_negative_cache(self) -> None:
         """清理过期项并限制 negative cache 大小，避免长期运行时无界增长。"""
-        cache = self._avatar_negative_cache
+        self._prune_expiring_cache(
+            self._avatar_negative_cache, TELEGRAM_AVATAR_NEGATIVE_CACHE_MAX_SIZE
+        )
+
+    @staticmethod
+    def _prune_expiring_cache(
+        cache: dict[str, tuple[float, Any]], max_size: int
+    ) -> None:
+        """清理 (expires_at, value) 形式缓存中的过期项，并按过期时间淘汰超出上限的条目。"""
         if not cache:
             return
 
         now = time.monotonic()
         expired_keys = [
-            user_id
-            for user_id, (expires_at, _reason) in cache.items()
-            if expires_at <= now
+            key for key, (expires_at, _value) in cache.items() if expires_at <= now
         ]
-        for user_id in expired_keys:
-            cache.pop(user_id, None)
+        for key in expired_keys:
+            cache.pop(key, None)
 
-        overflow = len(cache) - TELEGRAM_AVATAR_NEGATIVE_CACHE_MAX_SIZE
+        overflow = len(cache) - max_size
         if overflow <= 0:
             return
 
-        for user_id, _ in sorted(cache.items(), key=lambda item: item[1][0])[:overflow]:
-            cache.pop(user_id, None)
+        for key, _ in sorted(cache.items(), key=lambda item: item[1][0])[:overflow]:
+            cache.pop(key, None)
 
     def _get_avatar_negative_cache_reason(self, user_id: str) -> str | None:
         self._prune_avatar_negative_cache()
@@ -992,8 +1181,8 @@ class TelegramAdapter(PlatformAdapter):
         if not user_ids:
             return {}
 
-        # 适度并发，避免串行等待过久，也避免瞬时过载 Telegram API
-        semaphore = asyncio.Semaphore(8)
+        # 适度并发（可通过 avatar_concurrency 配置），避免串行等待过久，也避免瞬时过载 Telegram API
+        semaphore = asyncio.Semaphore(self._avatar_concurrency)
 
         async def _fetch_avatar(uid: str) -> tuple[str, str | None]:
             async with semaphore:
@@ -1088,9 +1277,11 @@ class TelegramAdapter(PlatformAdapter):
 
     # ==================== 辅助方法 ====================
 
-    def _parse_group_id(self, group_id: str) -> tuple[str, str | None]:
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def _parse_group_id(group_id: str) -> tuple[str, str | None]:
         """
-        解析群组 ID
+        解析群组 ID（纯函数，结果按群 ID 缓存）
 
         Telegram 话题群的 ID 格式为: "chat_id#thread_id"
 
@@ -285,7 +285,7 @@ class TelegramTemplatePreviewHandler:
             requester_id=requester_id,
             templates=available_templates.copy(),
             index=index,
-            created_at=time.time(),
+            created_at=time.monotonic(),
         )
         self._cleanup_expired_sessions()
         logger.info(
@@ -418,7 +418,7 @@ class TelegramTemplatePreviewHandler:
         if not session:
             await query.answer("预览会话已过期，请重新发送 /查看模板", show_alert=True)
             return
-        if time.time() - session.created_at > self._SESSION_TTL_SECONDS:
+        if time.monotonic() - session.created_at > self._SESSION_TTL_SECONDS:
             self._sessions.pop(token, None)
             await query.answer("预览会话已过期，请重新发送 /查看模板", show_alert=True)
             return
@@ -653,7 +653,7 @@ class TelegramTemplatePreviewHandler:
         return chat_id, thread_id
 
     def _cleanup_expired_sessions(self) -> None:
-        now = time.time()
+        now = time.monotonic()
         expired_tokens = [
             token
             for token, session in self._sessions.items()
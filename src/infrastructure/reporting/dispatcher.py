@@ -1,14 +1,36 @@
+import asyncio
 import base64
+import binascii
 import os
 import tempfile
+import time
 from collections.abc import Callable
-from datetime import datetime
+from dataclasses import dataclass
 from typing import Any
 
 from ...shared.constants import PLUGIN_NAME
 from ...shared.trace_context import TraceContext
 from ...utils.logger import logger
 
+# 临时目录在进程内不变，导入时取一次
+_TMPDIR = tempfile.gettempdir()
+
+# Base64 分块解码的块长度（字符数），须为 4 的倍数以保持分组对齐
+_B64_DECODE_CHUNK = 1 << 20
+
+
+@dataclass(frozen=True, slots=True)
+class DispatchConfig:
+    """单次分发所需配置的只读快照，避免每个格式/回退分支重复查询配置。"""
+
+    output_format: tuple[str, ...]
+    show_report_caption: bool
+    enable_file: bool
+    enable_album: bool
+    folder_name: str
+    album_name: str
+    album_strict_mode: bool
+
 
 class ReportDispatcher:
     """
@@ -26,13 +48,29 @@ class ReportDispatcher:
         self.report_generator = report_generator
         self.message_sender = message_sender
         self._html_render_func: Callable | None = None
+        # 最近一次生成的文本报告：(analysis_result, is_qq_official, (正文, 回退正文))
+        # 以对象身份匹配，图片/HTML 回退与显式 text 格式共用同一份结果
+        self._text_report_memo: tuple[Any, bool, tuple[str, str | None]] | None = None
 
     def set_html_render(self, render_func: Callable):
         """设置 HTML 渲染函数 (运行时注入)"""
         self._html_render_func = render_func
 
-    def _is_qq_official(self, platform_id: str | None) -> bool:
-        adapter = self.message_sender.bot_manager.get_adapter(platform_id)
+    def snapshot_config(self) -> DispatchConfig:
+        """读取一次当前配置，生成分发配置快照。"""
+        cm = self.config_manager
+        return DispatchConfig(
+            output_format=tuple(cm.get_output_format()),
+            show_report_caption=bool(cm.get_show_report_caption()),
+            enable_file=bool(cm.get_enable_group_file_upload()),
+            enable_album=bool(cm.get_enable_group_album_upload()),
+            folder_name=cm.get_group_file_folder(),
+            album_name=cm.get_group_album_name(),
+            album_strict_mode=cm.get_group_album_strict_mode(),
+        )
+
+    @staticmethod
+    def _is_qq_official_adapter(adapter) -> bool:
         return bool(adapter and adapter.get_platform_name() == "qq_official")
 
     async def dispatch(
@@ -40,15 +78,23 @@ class ReportDispatcher:
         group_id: str,
         analysis_result: dict[str, Any],
         platform_id: str | None = None,
+        cfg: DispatchConfig | None = None,
     ):
         """
         分发分析报告
+
+        批量分发时可传入同一份 cfg 快照复用，未传入则现场生成。
         """
         trace_id = TraceContext.get()
-        output_formats = self.config_manager.get_output_format()
+        if cfg is None:
+            cfg = self.snapshot_config()
+        output_formats = cfg.output_format
 
         logger.info(
-            f"[{trace_id}] 正在分发群 {group_id} 的报告 (格式: {', '.join(output_formats)})"
+            "[%s] 正在分发群 %s 的报告 (格式: %s)",
+            trace_id,
+            group_id,
+            ", ".join(output_formats),
         )
 
         dispatch_map = {
@@ -59,19 +105,31 @@ class ReportDispatcher:
         for fmt in output_formats:
             handler = dispatch_map.get(fmt)
             if handler:
-                await handler(group_id, analysis_result, platform_id)
+                await handler(group_id, analysis_result, platform_id, cfg=cfg)
 
-        logger.info(f"[{trace_id}] 群 {group_id} 的报告分发完成")
+        logger.info("[%s] 群 %s 的报告分发完成", trace_id, group_id)
 
     async def _dispatch_image(
-        self, group_id: str, analysis_result: dict[str, Any], platform_id: str | None
+        self,
+        group_id: str,
+        analysis_result: dict[str, Any],
+        platform_id: str | None,
+        cfg: DispatchConfig | None = None,
     ) -> bool:
-        trace_id = TraceContext.get()
+        # TraceID 仅在失败/回退分支的日志中使用，正常路径不读取
+        if cfg is None:
+            cfg = self.snapshot_config()
         # 1. 检查渲染函数
         if not self._html_render_func:
-            logger.warning(f"[{trace_id}] 未设置 HTML 渲染函数，回退到文本模式。")
+            logger.warning(
+                "[%s] 未设置 HTML 渲染函数，回退到文本模式。", TraceContext.get()
+            )
             return await self._dispatch_text(group_id, analysis_result, platform_id)
 
+        # 单次分发内只解析一次适配器：get_adapter 每次调用都会扫描已存储平台，
+        # 而头像回调会按用户数被反复调用
+        adapter = self.message_sender.bot_manager.get_adapter(platform_id)
+
         # 2. 生成图片
         image_url = None
         html_content = None
@@ -80,7 +138,6 @@ class ReportDispatcher:
             async def avatar_url_getter(user_id: str):
                 if not platform_id:
                     return None
-                adapter = self.message_sender.bot_manager.get_adapter(platform_id)
                 if adapter and hasattr(adapter, "get_user_avatar_url"):
                     return await adapter.get_user_avatar_url(user_id, size=40)
                 return None
@@ -91,19 +148,19 @@ class ReportDispatcher:
                 self._html_render_func,
                 avatar_url_getter=avatar_url_getter,
                 avatar_cache_namespace=platform_id,
-                allow_alphanumeric_user_ids=self._is_qq_official(platform_id),
+                allow_alphanumeric_user_ids=self._is_qq_official_adapter(adapter),
             )
         except Exception as e:
-            logger.error(f"[{trace_id}] Failed to generate image report: {e}")
+            logger.error(
+                "[%s] Failed to generate image report: %s", TraceContext.get(), e
+            )
             # image_url and html_content remain None
 
         # 4. 发送图片
         sent = False
         if image_url:
             caption = (
-                TraceContext.make_report_caption()
-                if self.config_manager.get_show_report_caption()
-                else ""
+                TraceContext.make_report_caption() if cfg.show_report_caption else ""
             )
             sent = await self.message_sender.send_image_smart(
                 group_id, image_url, caption, platform_id
@@ -111,21 +168,32 @@ class ReportDispatcher:
 
             # 5. 尝试上传到群文件/群相册（静默处理）
             # 无论消息发送是否成功（如超时回退），只要图片生成了，就尝试备份到群文件
-            await self._try_upload_image(group_id, image_url, platform_id)
+            await self._try_upload_image(
+                group_id, image_url, platform_id, cfg, adapter=adapter
+            )
 
         if sent:
             return True
 
         # 6. 最终回退：如果图片发送失败（包括生成失败或发送接口报错），直接尝试发送文本报告
         logger.warning(
-            f"[{trace_id}] Image dispatch failed, falling back to text report."
+            "[%s] Image dispatch failed, falling back to text report.",
+            TraceContext.get(),
         )
         return await self._dispatch_text(group_id, analysis_result, platform_id)
 
     async def _dispatch_html(
-        self, group_id: str, analysis_result: dict[str, Any], platform_id: str | None
+        self,
+        group_id: str,
+        analysis_result: dict[str, Any],
+        platform_id: str | None,
+        cfg: DispatchConfig | None = None,
     ) -> bool:
-        trace_id = TraceContext.get()
+        # TraceID 仅在失败/回退分支的日志中使用，正常路径不读取
+        if cfg is None:
+            cfg = self.snapshot_config()
+
+        adapter = self.message_sender.bot_manager.get_adapter(platform_id)
 
         html_path = None
         try:
@@ -133,7 +201,6 @@ class ReportDispatcher:
             async def avatar_url_getter(user_id: str):
                 if not platform_id:
                     return None
-                adapter = self.message_sender.bot_manager.get_adapter(platform_id)
                 if adapter and hasattr(adapter, "get_user_avatar_url"):
                     return await adapter.get_user_avatar_url(user_id, size=40)
                 return None
@@ -143,10 +210,12 @@ class ReportDispatcher:
                 group_id,
                 avatar_url_getter=avatar_url_getter,
                 avatar_cache_namespace=platform_id,
-                allow_alphanumeric_user_ids=self._is_qq_official(platform_id),
+                allow_alphanumeric_user_ids=self._is_qq_official_adapter(adapter),
             )
         except Exception as e:
-            logger.error(f"[{trace_id}] Failed to generate HTML report: {e}")
+            logger.error(
+                "[%s] Failed to generate HTML report: %s", TraceContext.get(), e
+            )
 
         if html_path:
             is_only_url = self.config_manager.get_html_only_url()
@@ -181,12 +250,14 @@ class ReportDispatcher:
                         return True
                 else:
                     logger.warning(
-                        f"[{trace_id}] 群 {group_id} 开启了仅发送外链，但未配置 html_base_url，已进行降级，回退至发送 HTML 文件。"
+                        "[%s] 群 %s 开启了仅发送外链，但未配置 html_base_url，已进行降级，回退至发送 HTML 文件。",
+                        TraceContext.get(),
+                        group_id,
                     )
 
             caption = (
                 self.report_generator.build_html_caption(html_path)
-                if self.config_manager.get_show_report_caption()
+                if cfg.show_report_caption
                 else ""
             )
 
@@ -200,29 +271,27 @@ class ReportDispatcher:
                 return True
 
         logger.warning(
-            f"[{trace_id}] HTML dispatch failed, falling back to text report."
+            "[%s] HTML dispatch failed, falling back to text report.",
+            TraceContext.get(),
         )
         return await self._dispatch_text(group_id, analysis_result, platform_id)
 
     async def _dispatch_text(
-        self, group_id: str, analysis_result: dict[str, Any], platform_id: str | None
+        self,
+        group_id: str,
+        analysis_result: dict[str, Any],
+        platform_id: str | None,
+        cfg: DispatchConfig | None = None,
     ) -> bool:
-        """分发文本报告"""
-        logger.info(f"[分发器] 正在向群组 {group_id} 分发文本报告")
-        is_qq_official = self._is_qq_official(platform_id)
-        fallback_report = None
-        if is_qq_official:
-            (
-                text_report,
-                fallback_report,
-            ) = await self.report_generator.generate_qq_official_markdown_report(
-                analysis_result, self._html_render_func
-            )
-        else:
-            text_report = self.report_generator.generate_text_report(analysis_result)
+        """分发文本报告（文本格式不依赖分发配置，cfg 仅为统一分发签名保留）"""
+        logger.info("[分发器] 正在向群组 %s 分发文本报告", group_id)
         adapter = self.message_sender.bot_manager.get_adapter(platform_id)
+        is_qq_official = self._is_qq_official_adapter(adapter)
+        text_report, fallback_report = await self._get_text_report(
+            analysis_result, is_qq_official
+        )
         # 尝试通过适配器发送文本报告
-        logger.info(f"[分发器] 正在尝试通过适配器发送文本报告。群: {group_id}")
+        logger.info("[分发器] 正在尝试通过适配器发送文本报告。群: %s", group_id)
         try:
             if adapter:
                 if is_qq_official:
@@ -238,9 +307,41 @@ class ReportDispatcher:
                 group_id, f"📊 每日群聊分析报告：\n\n{text_report}", platform_id
             )
         except Exception as e:
-            logger.error(f"[分发器] 发送文本报告最终失败。群: {group_id}, 错误: {e}")
+            logger.error("[分发器] 发送文本报告最终失败。群: %s, 错误: %s", group_id, e)
             return False
 
+    async def _get_text_report(
+        self, analysis_result: dict[str, Any], is_qq_official: bool
+    ) -> tuple[str, str | None]:
+        """
+        生成文本报告，同一分析结果重复请求时直接复用上次结果。
+
+        图片/HTML 发送失败回退到文本、且同时配置了 text 格式时，
+        文本报告（QQ 官方平台还包含概览图渲染）只需生成一次。
+        """
+        memo = self._text_report_memo
+        if (
+            memo is not None
+            and memo[0] is analysis_result
+            and memo[1] == is_qq_official
+        ):
+            return memo[2]
+
+        fallback_report = None
+        if is_qq_official:
+            (
+                text_report,
+                fallback_report,
+            ) = await self.report_generator.generate_qq_official_markdown_report(
+                analysis_result, self._html_render_func
+            )
+        else:
+            text_report = self.report_generator.generate_text_report(analysis_result)
+
+        result = (text_report, fallback_report)
+        self._text_report_memo = (analysis_result, is_qq_official, result)
+        return result
+
     # ================================================================
     # 图片报告上传到群文件 / 群相册（仅 QQ 平台 image 格式）
     # ================================================================
@@ -250,61 +351,103 @@ class ReportDispatcher:
         group_id: str,
         image_url: str,
         platform_id: str | None,
+        cfg: DispatchConfig | None = None,
+        adapter=None,
     ):
         """
         尝试将图片报告上传到群文件和/或群相册。
 
         仅在配置启用且平台为 OneBot 时执行，失败静默处理。
+        adapter 为调用方已解析的适配器，传入时不再重复查询。
         """
-        enable_file = self.config_manager.get_enable_group_file_upload()
-        enable_album = self.config_manager.get_enable_group_album_upload()
+        if cfg is None:
+            cfg = self.snapshot_config()
+        enable_file = cfg.enable_file
+        enable_album = cfg.enable_album
         if not enable_file and not enable_album:
             return
 
         # 仅 OneBot 平台支持
-        adapter = self._get_onebot_adapter(platform_id)
+        adapter = self._get_onebot_adapter(platform_id, adapter)
         if not adapter:
             return
 
-        # 将图片保存为临时文件
-        image_file = self._save_image_to_temp(image_url, group_id)
-        if not image_file:
-            return
+        # 适配器可直接接收 base64:// 负载时跳过临时文件的写入、读取与删除；
+        # 否则落盘为临时文件。仅 base64/data 负载会生成临时文件，本地路径原样使用
+        filename = None
+        owns_file = False
+        if (
+            image_url.startswith("base64://")
+            and adapter.get_capabilities().supports_base64_upload
+        ):
+            image_file = image_url
+            filename = self._report_image_filename(group_id)
+        else:
+            image_file = await self._save_image_to_temp(image_url, group_id)
+            if not image_file:
+                return
+            owns_file = image_url.startswith(("base64://", "data:"))
 
         try:
-            # 上传到群文件
+            # 群文件与群相册上传互不依赖，并发执行
+            uploads = []
             if enable_file:
-                await self._do_upload_group_file(adapter, group_id, image_file)
-
-            # 上传到群相册
+                uploads.append(
+                    self._do_upload_group_file(
+                        adapter, group_id, image_file, cfg.folder_name, filename
+                    )
+                )
             if enable_album:
-                await self._do_upload_group_album(adapter, group_id, image_file)
+                uploads.append(
+                    self._do_upload_group_album(
+                        adapter,
+                        group_id,
+                        image_file,
+                        cfg.album_name,
+                        cfg.album_strict_mode,
+                    )
+                )
+            # 各上传方法自行吞掉异常，return_exceptions 仅作防御
+            await asyncio.gather(*uploads, return_exceptions=True)
         finally:
-            try:
-                os.remove(image_file)
-            except OSError:
-                pass
+            if owns_file:
+                try:
+                    os.remove(image_file)
+                except OSError:
+                    pass
 
-    async def _do_upload_group_file(self, adapter, group_id: str, file_path: str):
+    async def _do_upload_group_file(
+        self,
+        adapter,
+        group_id: str,
+        file_path: str,
+        folder_name: str,
+        filename: str | None = None,
+    ):
         """上传文件到群文件目录，失败静默"""
         try:
-            folder_name = self.config_manager.get_group_file_folder()
             folder_id = None
             if folder_name:
                 folder_id = await adapter.find_or_create_folder(group_id, folder_name)
             await adapter.upload_group_file_to_folder(
                 group_id=group_id,
                 file_path=file_path,
+                filename=filename,
                 folder_id=folder_id,
             )
         except Exception as e:
-            logger.warning(f"群文件上传失败 (群 {group_id}): {e}")
+            logger.warning("群文件上传失败 (群 %s): %s", group_id, e)
 
-    async def _do_upload_group_album(self, adapter, group_id: str, file_path: str):
+    async def _do_upload_group_album(
+        self,
+        adapter,
+        group_id: str,
+        file_path: str,
+        album_name: str,
+        strict_mode: bool,
+    ):
         """上传图片到群相册，失败静默"""
         try:
-            album_name = self.config_manager.get_group_album_name()
-            strict_mode = self.config_manager.get_group_album_strict_mode()
             album_id = None
 
             if hasattr(adapter, "find_album_id"):
@@ -312,12 +455,15 @@ class ReportDispatcher:
                     album_id = await adapter.find_album_id(group_id, album_name)
                     if not album_id and strict_mode:
                         logger.info(
-                            f"群相册严格模式开启：在群 {group_id} 中未找到名为 '{album_name}' 的相册，停止上传。"
+                            "群相册严格模式开启：在群 %s 中未找到名为 '%s' 的相册，停止上传。",
+                            group_id,
+                            album_name,
                         )
                         return
                 elif strict_mode:
                     logger.info(
-                        f"群相册严格模式开启：未设置目标相册名称，停止上传以防止操作群 {group_id} 的默认相册。"
+                        "群相册严格模式开启：未设置目标相册名称，停止上传以防止操作群 %s 的默认相册。",
+                        group_id,
                     )
                     return
 
@@ -329,44 +475,104 @@ class ReportDispatcher:
                 strict_mode=strict_mode,
             )
         except Exception as e:
-            logger.warning(f"群相册上传失败 (群 {group_id}): {e}")
+            logger.warning("群相册上传失败 (群 %s): %s", group_id, e)
 
-    def _save_image_to_temp(self, image_url: str, group_id: str) -> str | None:
-        """将 base64 图片保存为临时 PNG 文件，返回路径。失败返回 None。"""
-        try:
-            image_data = None
-            if image_url.startswith("base64://"):
-                image_data = base64.b64decode(image_url[len("base64://") :])
-            elif image_url.startswith("data:"):
-                parts = image_url.split(",", 1)
-                if len(parts) == 2:
-                    image_data = base64.b64decode(parts[1])
-            elif os.path.isfile(image_url):
-                return os.path.abspath(image_url)
-            elif image_url.startswith("file:///"):
-                p = image_url[len("file:///") :]
-                if os.path.isfile(p):
-                    return os.path.abspath(p)
-
-            if not image_data:
-                return None
+    async def _save_image_to_temp(self, image_url: str, group_id: str) -> str | None:
+        """将 base64 图片保存为临时 PNG 文件，返回路径。失败返回 None。
 
-            date_str = datetime.now().strftime("%Y%m%d_%H%M%S")
-            path = os.path.join(
-                tempfile.gettempdir(), f"群聊分析报告_{group_id}_{date_str}.png"
+        Base64 解码与磁盘写入在工作线程中完成，不阻塞事件循环。
+        """
+        try:
+            return await asyncio.to_thread(
+                self._write_image_to_temp, image_url, group_id
             )
-            with open(path, "wb") as f:
-                f.write(image_data)
-            return path
         except Exception as e:
-            logger.debug(f"保存图片到临时文件失败: {e}")
+            logger.debug("保存图片到临时文件失败: %s", e)
+            return None
+
+    @staticmethod
+    def _write_image_to_temp(image_url: str, group_id: str) -> str | None:
+        """同步执行解码与写入（供工作线程调用）。
+
+        Base64 负载按块解码并直接写入文件，不切出整段负载副本，
+        也不在内存中保留完整的解码结果。
+        """
+        payload_start = -1
+        if image_url.startswith("base64://"):
+            payload_start = len("base64://")
+        elif image_url.startswith("data:"):
+            comma = image_url.find(",")
+            if comma != -1:
+                payload_start = comma + 1
+        elif os.path.isfile(image_url):
+            return os.path.abspath(image_url)
+        elif image_url.startswith("file:///"):
+            p = image_url[len("file:///") :]
+            if os.path.isfile(p):
+                return os.path.abspath(p)
+
+        if payload_start < 0 or payload_start >= len(image_url):
             return None
 
-    def _get_onebot_adapter(self, platform_id: str | None):
+        path = os.path.join(_TMPDIR, ReportDispatcher._report_image_filename(group_id))
+        # 直接使用底层文件描述符写入，跳过 Python 缓冲写入器
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        written = 0
+        try:
+            try:
+                for start in range(payload_start, len(image_url), _B64_DECODE_CHUNK):
+                    written += ReportDispatcher._write_fd(
+                        fd,
+                        base64.b64decode(image_url[start : start + _B64_DECODE_CHUNK]),
+                    )
+            except binascii.Error:
+                # 负载含换行等非 Base64 字符（如按行折叠的输出）时分块会错位，
+                # 回退为整体解码：b64decode 会跳过这些字符，与原先行为一致
+                os.lseek(fd, 0, os.SEEK_SET)
+                os.ftruncate(fd, 0)
+                written = ReportDispatcher._write_fd(
+                    fd, base64.b64decode(image_url[payload_start:])
+                )
+        except Exception:
+            os.close(fd)
+            ReportDispatcher._remove_quietly(path)
+            raise
+        os.close(fd)
+        if not written:
+            ReportDispatcher._remove_quietly(path)
+            return None
+        return path
+
+    @staticmethod
+    def _write_fd(fd: int, data: bytes) -> int:
+        """将数据完整写入文件描述符，返回写入的字节数。"""
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view) :]
+        return len(data)
+
+    @staticmethod
+    def _remove_quietly(path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    @staticmethod
+    def _report_image_filename(group_id: str) -> str:
+        """生成图片报告上传时使用的文件名。"""
+        t = time.localtime()
+        return (
+            f"群聊分析报告_{group_id}_{t.tm_year}{t.tm_mon:02d}{t.tm_mday:02d}_"
+            f"{t.tm_hour:02d}{t.tm_min:02d}{t.tm_sec:02d}.png"
+        )
+
+    def _get_onebot_adapter(self, platform_id: str | None, adapter=None):
         """获取 OneBot 适配器，非 OneBot 平台返回 None。"""
         if not platform_id:
             return None
-        adapter = self.message_sender.bot_manager.get_adapter(platform_id)
+        if adapter is None:
+            adapter = self.message_sender.bot_manager.get_adapter(platform_id)
         if adapter and hasattr(adapter, "upload_group_file_to_folder"):
             return adapter
         return None
@@ -11,6 +11,7 @@ import html
 import json
 import os
 import re
+from collections import OrderedDict
 from dataclasses import asdict, is_dataclass
 from datetime import date, datetime
 from enum import Enum
@@ -32,6 +33,8 @@ from .templates import HTMLTemplates
 
 MAX_CONCURRENT_DOWNLOADS = 10
 AVATAR_CACHE_EXPIRE_TIME = 259200
+# 渲染结果缓存条目上限：每条为一张完整报告图片的 base64，仅保留最近几份
+RENDER_CACHE_SIZE = 8
 TRANSPARENT_IMAGE_DATA_URI = (
     "data:image/svg+xml;base64,"
     "PHN2ZyB4bWxucz0iaHR0cDovL3d3dy53My5vcmcvMjAwMC9zdmciIHdpZHRoPSIxIiBoZWlnaHQ9IjEiPjwvc3ZnPg=="
@@ -123,6 +126,8 @@ class ReportGenerator(IReportGenerator):
         )
         self._avatar_session = None
         self._profile_asset_manifest = self._load_profile_asset_manifest()
+        # HTML 内容与渲染策略的摘要 -> base64 图片；HTML 未变化时跳过 T2I 渲染
+        self._render_cache: OrderedDict[str, str] = OrderedDict()
 
     def _load_profile_asset_manifest(self) -> dict[str, dict]:
         """加载人格资源清单。"""
@@ -394,6 +399,15 @@ class ReportGenerator(IReportGenerator):
             # 从配置中获取两轮渲染策略
             render_strategies = self.config_manager.get_t2i_rendering_strategies()
 
+            render_key = self._build_render_cache_key(
+                html_content, render_payload, render_strategies
+            )
+            cached_url = self._render_cache.get(render_key)
+            if cached_url is not None:
+                self._render_cache.move_to_end(render_key)
+                logger.info(f"图片报告命中渲染缓存，跳过重复渲染 (群: {group_id})")
+                return cached_url, html_content
+
             # 使用信号量控制并发进入渲染引擎
             async with self._render_semaphore:
                 logger.debug(f"[T2I] 已进入渲染队列 (群: {group_id})")
@@ -475,6 +489,9 @@ class ReportGenerator(IReportGenerator):
                                     logger.info(
                                         f"图片生成成功 (轮次 {attempt}): [Base64 Data {len(image_data)} bytes]"
                                     )
+                                    self._render_cache[render_key] = image_url
+                                    if len(self._render_cache) > RENDER_CACHE_SIZE:
+                                        self._render_cache.popitem(last=False)
                                     return image_url, html_content
                                 elif isinstance(image_data, str):
                                     logger.info(
@@ -506,6 +523,33 @@ class ReportGenerator(IReportGenerator):
                 await self._avatar_session.close()
                 self._avatar_session = None
 
+    @staticmethod
+    def _build_render_cache_key(
+        html_content: str, render_payload: dict, render_strategies: Any
+    ) -> str:
+        """
+        计算图片渲染缓存键。
+
+        模板中嵌入的秒级生成时间 (current_datetime) 每次都不同，计算摘要前将其剔除，
+        否则内容未变化的群也永远无法命中；日期 (current_date) 单独计入，
+        保证缓存只在同一天内复用。命中时图片保留首次渲染时的生成时间。
+        """
+        key_html = html_content
+        current_datetime = render_payload.get("current_datetime")
+        if current_datetime:
+            key_html = key_html.replace(str(current_datetime), "")
+        extra = json.dumps(
+            [
+                render_payload.get("current_date") or date.today().isoformat(),
+                render_strategies,
+            ],
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.blake2b(
+            key_html.encode("utf-8") + extra.encode("utf-8"), digest_size=16
+        ).hexdigest()
+
     async def generate_html_report(
         self,
         analysis_result: dict,
@@ -362,7 +362,16 @@ class AutoScheduler:
                 f"定时报告: {len(all_targets)} 个目标 (并发限制: {max_concurrent})"
             )
 
-            async def dispatch_group(gid, pid, mode):
+            stagger = self.config_manager.get_stagger_seconds() or 2
+
+            async def dispatch_group(idx, gid, pid, mode):
+                # 针对定时大任务加入交错等待，减少瞬间峰值延迟。
+                # 启动偏移一次性算好，任务批量创建，无需在创建循环中逐个串行 sleep
+                if idx > 0 and stagger > 0:
+                    await asyncio.sleep(stagger * idx)
+                    if self._terminating:
+                        return {"success": False, "reason": "terminating"}
+
                 async with sem:
                     if mode == "incremental":
                         return await self._perform_incremental_final_report_for_group_with_timeout(
@@ -374,19 +383,13 @@ class AutoScheduler:
                         )
 
             tasks = []
-            stagger = self.config_manager.get_stagger_seconds() or 2
-            # 针对定时大任务加入交错等待，减少瞬间峰值延迟
             for idx, (gid, pid, mode) in enumerate(all_targets):
                 if self._terminating:
                     logger.info("检测到插件正在停止，取消后续任务创建")
                     break
 
-                # 为前几个任务添加微小的启动间隔，均匀分散 API 压力
-                if idx > 0 and stagger > 0:
-                    await asyncio.sleep(stagger)
-
                 task = asyncio.create_task(
-                    dispatch_group(gid, pid, mode),
+                    dispatch_group(idx, gid, pid, mode),
                     name=f"report_{mode}_{gid}",
                 )
                 tasks.append(task)
@@ -1,3 +1,5 @@
+import logging
+
 from astrbot.api import logger as astrbot_logger
 
 from ..shared.trace_context import TraceContext
@@ -21,23 +23,36 @@ class PluginLogger:
             return f"[{trace_id}] {self.prefix} {msg}"
         return f"{self.prefix} {msg}"
 
+    def isEnabledFor(self, level: int) -> bool:
+        """判断指定级别的日志是否会被输出。"""
+        return astrbot_logger.isEnabledFor(level)
+
+    # 各级别先判断是否启用：被过滤的日志不再查询 TraceID、拼接前缀，
+    # 避免在热路径上为不会输出的日志做格式化工作
+
     def info(self, msg: str, *args, **kwargs):
-        astrbot_logger.info(self._format_msg(msg), *args, **kwargs)
+        if astrbot_logger.isEnabledFor(logging.INFO):
+            astrbot_logger.info(self._format_msg(msg), *args, **kwargs)
 
     def error(self, msg: str, *args, **kwargs):
-        astrbot_logger.error(self._format_msg(msg), *args, **kwargs)
+        if astrbot_logger.isEnabledFor(logging.ERROR):
+            astrbot_logger.error(self._format_msg(msg), *args, **kwargs)
 
     def warning(self, msg: str, *args, **kwargs):
-        astrbot_logger.warning(self._format_msg(msg), *args, **kwargs)
+        if astrbot_logger.isEnabledFor(logging.WARNING):
+            astrbot_logger.warning(self._format_msg(msg), *args, **kwargs)
 
     def debug(self, msg: str, *args, **kwargs):
-        astrbot_logger.debug(self._format_msg(msg), *args, **kwargs)
+        if astrbot_logger.isEnabledFor(logging.DEBUG):
+            astrbot_logger.debug(self._format_msg(msg), *args, **kwargs)
 
     def critical(self, msg: str, *args, **kwargs):
-        astrbot_logger.critical(self._format_msg(msg), *args, **kwargs)
+        if astrbot_logger.isEnabledFor(logging.CRITICAL):
+            astrbot_logger.critical(self._format_msg(msg), *args, **kwargs)
 
     def exception(self, msg: str, *args, **kwargs):
-        astrbot_logger.exception(self._format_msg(msg), *args, **kwargs)
+        if astrbot_logger.isEnabledFor(logging.ERROR):
+            astrbot_logger.exception(self._format_msg(msg), *args, **kwargs)
 
 
 # 导出带前缀的 logger
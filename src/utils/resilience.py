@@ -1,5 +1,7 @@
 import asyncio
 import time
+from collections.abc import Callable
+from typing import Any, ClassVar
 
 from .logger import logger
 
@@ -21,6 +23,17 @@ class CircuitBreaker:
     STATE_OPEN = "OPEN"
     STATE_HALF_OPEN = "HALF_OPEN"
 
+    # 每个 LLM Provider 持有一个熔断器，且每次调用都会读取其状态；
+    # 使用 __slots__ 省去实例 __dict__，加快属性访问并减少内存占用
+    __slots__ = (
+        "failure_count",
+        "failure_threshold",
+        "last_failure_time",
+        "name",
+        "recovery_timeout",
+        "state",
+    )
+
     def __init__(
         self,
         failure_threshold: int = 5,
@@ -46,22 +59,11 @@ class CircuitBreaker:
     def record_failure(self) -> None:
         """记录一次调用失败，并根据阈值决定是否切换到 OPEN 状态。"""
         self.failure_count += 1
-        if (
-            self.state == self.STATE_CLOSED
-            and self.failure_count >= self.failure_threshold
-        ):
-            self._open_circuit()
-        elif self.state == self.STATE_HALF_OPEN:
-            # 半开状态下任何一次失败都将立即导致熔断重开
-            self._open_circuit()
+        self._FAILURE_HANDLERS[self.state](self)
 
     def record_success(self) -> None:
         """记录一次调用成功，并尝试重置或关闭熔断器。"""
-        if self.state == self.STATE_HALF_OPEN:
-            self._close_circuit()
-        elif self.state == self.STATE_CLOSED:
-            # 正常状态下的成功重置累积计数值
-            self.failure_count = 0
+        self._SUCCESS_HANDLERS[self.state](self)
 
     def allow_request(self) -> bool:
         """
@@ -70,14 +72,55 @@ class CircuitBreaker:
         Returns:
             bool: True 为允许，False 为拦截
         """
-        if self.state == self.STATE_OPEN:
-            # 检查冷却时间是否已过，过则进入试探性的半开状态
-            if time.monotonic() - self.last_failure_time > self.recovery_timeout:
-                self._half_open_circuit()
-                return True
-            return False
+        return self._ALLOW_HANDLERS[self.state](self)
+
+    # ---- 各状态下的处理函数（经下方查找表按当前状态分派） ----
+
+    def _on_failure_closed(self) -> None:
+        if self.failure_count >= self.failure_threshold:
+            self._open_circuit()
+
+    def _on_failure_half_open(self) -> None:
+        # 半开状态下任何一次失败都将立即导致熔断重开
+        self._open_circuit()
+
+    def _on_success_closed(self) -> None:
+        # 正常状态下的成功重置累积计数值
+        self.failure_count = 0
+
+    def _on_success_half_open(self) -> None:
+        self._close_circuit()
+
+    def _allow_when_open(self) -> bool:
+        # 检查冷却时间是否已过，过则进入试探性的半开状态
+        if time.monotonic() - self.last_failure_time > self.recovery_timeout:
+            self._half_open_circuit()
+            return True
+        return False
+
+    def _allow_always(self) -> bool:
         return True
 
+    def _noop(self) -> None:
+        pass
+
+    # 状态 -> 处理函数查找表，取代每次调用时的 if/elif 状态判断
+    _FAILURE_HANDLERS: ClassVar[dict[str, Callable[..., Any]]] = {
+        STATE_CLOSED: _on_failure_closed,
+        STATE_OPEN: _noop,
+        STATE_HALF_OPEN: _on_failure_half_open,
+    }
+    _SUCCESS_HANDLERS: ClassVar[dict[str, Callable[..., Any]]] = {
+        STATE_CLOSED: _on_success_closed,
+        STATE_OPEN: _noop,
+        STATE_HALF_OPEN: _on_success_half_open,
+    }
+    _ALLOW_HANDLERS: ClassVar[dict[str, Callable[..., Any]]] = {
+        STATE_CLOSED: _allow_always,
+        STATE_OPEN: _allow_when_open,
+        STATE_HALF_OPEN: _allow_always,
+    }
+
     def _open_circuit(self) -> None:
         """动作：开启熔断"""
         self.state = self.STATE_OPEN
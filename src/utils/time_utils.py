@@ -0,0 +1,25 @@
+import time
+from datetime import datetime, timedelta
+
+# 当日日期字符串缓存：仅在跨越本地零点后重新格式化
+_today_cache: dict[str, float | str] = {"start": 0.0, "end": 0.0, "value": ""}
+
+
+def today_str() -> str:
+    """
+    获取当前本地日期字符串 (YYYY-MM-DD)。
+
+    结果按天缓存，同一天内的重复调用只需一次 time.time() 比较，
+    避免每次都构造 datetime 并执行 strftime。
+
+    Returns:
+        str: 当前日期字符串
+    """
+    now = time.time()
+    if not (_today_cache["start"] <= now < _today_cache["end"]):
+        current = datetime.fromtimestamp(now)
+        day_start = current.replace(hour=0, minute=0, second=0, microsecond=0)
+        _today_cache["start"] = day_start.timestamp()
+        _today_cache["end"] = (day_start + timedelta(days=1)).timestamp()
+        _today_cache["value"] = current.strftime("%Y-%m-%d")
+    return _today_cache["value"]